@@ -1,13 +1,227 @@
-from flask import Flask, render_template, request, jsonify, send_file, url_for
-from scraper import WebScraper, ScraperError, AuthenticationError, ScrapingError, SelectorError, SeleniumError
-import json
+if __name__ == '__main__':
+    # Patch the stdlib before requests/selenium/flask are imported so their
+    # socket, DNS and SSL calls yield to the gevent hub while waiting on I/O.
+    # Under Gunicorn the gevent worker class (-k gevent) does this for us.
+    from gevent import monkey
+    monkey.patch_all()
+
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory, url_for
+from scraper import WebScraper, DriverPool, HTTPCache, PlaywrightBrowser, ProcessPool, RedisVisitedSet, RenderPool, run_async, ScraperError, AuthenticationError, ScrapingError, SelectorError, SeleniumError
+import asyncio
+import atexit
+import click
+import gzip
+import hashlib
+import mmap
 import os
+import queue
+import sys
+import threading
+import time
 import logging
 from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import traceback
+import orjson
+import redis
+import uuid
+import weakref
+from werkzeug.security import safe_join
+from schemas import ScrapeRequest, validation_error_message
+from pydantic import ValidationError
 from config import config
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+def _gevent_patched():
+    """Return whether gevent has monkey-patched the socket module."""
+    try:
+        from gevent import monkey
+    except ImportError:
+        return False
+    return monkey.is_module_patched('socket')
+
+# Run the async fetchers on uvloop where it is installed. They share one loop
+# (see scraper.run_async), which under gevent runs in a greenlet of the hub
+# serving the requests, so there the stock loop is kept: it waits on patched
+# selectors, whereas uvloop would block the hub and every request with it.
+if uvloop is not None and sys.platform != 'win32' and not _gevent_patched():
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+class _JSONArrayWriter:
+    """
+    Write records to a JSON array file as they are produced.
+    
+    Each record is serialized on its own line, so the file stays valid JSON
+    while it can still be read back a record at a time (see _read_records).
+    If the block exits with an exception the partial file is removed.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.count = 0
+        self._file = None
+
+    def __enter__(self):
+        self._file = open(self.filepath, 'wb')
+        self._file.write(b'[')
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._file.write(b'\n]\n')
+        self._file.close()
+        if exc_type is not None:
+            os.remove(self.filepath)
+
+    def write(self, item):
+        """Append a single record to the file."""
+        self._file.write(b',\n' if self.count else b'\n')
+        self._file.write(orjson.dumps(item))
+        self.count += 1
+
+def _read_records(filepath, limit):
+    """Read the first limit records from a file written by _JSONArrayWriter."""
+    records = []
+    with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        mm.readline()  # Opening bracket
+        while len(records) < limit:
+            line = mm.readline().rstrip(b',\n')
+            if not line or line == b']':
+                break
+            records.append(orjson.loads(line))
+    return records
+
+def _json_response(payload, status=200):
+    """Build a JSON response serialized with orjson."""
+    return Response(orjson.dumps(payload), status=status, mimetype='application/json')
+
+def _bad_request(error):
+    """Build the 400 response for a scrape request that failed validation."""
+    if isinstance(error, ValidationError):
+        return _json_response({
+            'error': validation_error_message(error),
+            'details': error.errors(include_url=False, include_context=False)
+        }, 400)
+    return _json_response({
+        'error': str(error)
+    }, 400)
+
+def _scrape_cache_key(url, selectors, options):
+    """Build the Redis key for a scrape of url with the given selectors and options."""
+    request_key = orjson.dumps([selectors, options], option=orjson.OPT_SORT_KEYS)
+    return 'scrape:' + hashlib.sha1(url.encode() + request_key).hexdigest()
+
+def _write_job(filepath, state):
+    """Replace a job's state file in one step, so no worker reads it half-written."""
+    tmp_path = f'{filepath}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(state))
+    os.replace(tmp_path, filepath)
+
+def _process_alive(pid):
+    """Return whether a process with the given id is running on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+def _job_expired(filepath, ttl):
+    """
+    Return whether a job's state is older than ttl seconds and can be dropped.
+    
+    A job that is queued or running is kept for as long as the worker process
+    that owns it lives, however long that takes; only when that process is gone,
+    e.g. killed mid-job, does the stale state expire.
+    """
+    if time.time() - os.path.getmtime(filepath) <= ttl:
+        return False
+    with open(filepath, 'rb') as f:
+        state = orjson.loads(f.read())
+    return state['done'] or 'pid' not in state or not _process_alive(state['pid'])
+
+def _read_job(filepath, ttl):
+    """Read a job's state, or return None if the job is unknown or has expired."""
+    try:
+        if _job_expired(filepath, ttl):
+            os.remove(filepath)
+            return None
+        with open(filepath, 'rb') as f:
+            return orjson.loads(f.read())
+    except FileNotFoundError:
+        return None
+
+def _prune_jobs(job_dir, ttl):
+    """Remove the state of expired jobs, such as finished ones never collected."""
+    with os.scandir(job_dir) as entries:
+        for entry in entries:
+            try:
+                if _job_expired(entry.path, ttl):
+                    os.remove(entry.path)
+            except (FileNotFoundError, orjson.JSONDecodeError):
+                pass
+
+# Directories and log handlers are shared by every app created in this process,
+# so repeated create_app calls don't stat the filesystem or stack handlers
+_CREATED_DIRS = set()
+_LOG_HANDLERS = {}
+
+def _ensure_dir(path):
+    """Create a directory the first time it is needed."""
+    if path and path not in _CREATED_DIRS:
+        os.makedirs(path, exist_ok=True)
+        _CREATED_DIRS.add(path)
+
+def _log_handler(log_file):
+    """Return the process-wide rotating handler for log_file, creating it once."""
+    handler = _LOG_HANDLERS.get(log_file)
+    if handler is None:
+        handler = RotatingFileHandler(
+            log_file,
+            maxBytes=10000000,  # 10MB
+            backupCount=5
+        )
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        _LOG_HANDLERS[log_file] = handler
+    return handler
+
+# Resources create_app keeps in app.extensions, with the method that releases
+# each, in the order they are closed: jobs stop before the pools they use
+_APP_RESOURCES = [
+    ('scrape_pool', 'shutdown'),
+    ('playwright_browser', 'close'),
+    ('render_pool', 'shutdown'),
+    ('parse_pool', 'shutdown'),
+    ('driver_pool', 'close'),
+    ('http_cache', 'close'),
+    ('redis', 'close'),
+]
+
+# Apps whose resources are still open, closed by a single hook at exit
+_OPEN_APPS = weakref.WeakSet()
+
+def close_app(app):
+    """Release the pools, browsers and connections that create_app opened for app."""
+    _OPEN_APPS.discard(app)
+    for name, method in _APP_RESOURCES:
+        resource = app.extensions.pop(name, None)
+        if resource is None:
+            continue
+        try:
+            getattr(resource, method)()
+        except Exception as e:
+            app.logger.error(f"Failed to close {name}: {str(e)}")
+
+@atexit.register
+def _close_open_apps():
+    for app in list(_OPEN_APPS):
+        close_app(app)
+
 def create_app(config_name='default'):
     """Application factory function."""
     app = Flask(__name__)
@@ -16,153 +230,409 @@ def create_app(config_name='default'):
     app.config.from_object(config[config_name])
     
     # Ensure required directories exist
-    os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-    os.makedirs('logs', exist_ok=True)
+    _ensure_dir(app.config['UPLOAD_FOLDER'])
+    _ensure_dir(os.path.dirname(app.config['LOG_FILE']))
     
     # Configure logging
-    handler = RotatingFileHandler(
-        app.config['LOG_FILE'],
-        maxBytes=10000000,  # 10MB
-        backupCount=5
-    )
-    handler.setLevel(app.config['LOG_LEVEL'])
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    handler.setFormatter(formatter)
-    app.logger.addHandler(handler)
     app.logger.setLevel(app.config['LOG_LEVEL'])
+    handler = _log_handler(app.config['LOG_FILE'])
+    handler.setLevel(app.config['LOG_LEVEL'])
+    if handler not in app.logger.handlers:
+        app.logger.addHandler(handler)
+    if not app.debug:
+        # Don't print tracebacks to stderr when a log record fails to emit
+        logging.raiseExceptions = False
+
+    # Everything opened below is released by close_app, at the latest on exit
+    _OPEN_APPS.add(app)
+
+    # Shared pool of warm WebDrivers for Selenium scrapes
+    driver_pool = DriverPool(
+        size=app.config['SELENIUM_POOL_SIZE'],
+        max_uses=app.config['SELENIUM_MAX_USES'],
+        remote_url=app.config['SELENIUM_REMOTE_URL']
+    )
+    app.extensions['driver_pool'] = driver_pool
+
+    # Optional pool of browser processes that render Selenium crawls in parallel
+    render_pool = None
+    if app.config['SELENIUM_CRAWL_WORKERS'] > 1 and app.config['BROWSER_ENGINE'] != 'playwright':
+        render_pool = RenderPool(app.config['SELENIUM_CRAWL_WORKERS'],
+                                 app.config['SELENIUM_REMOTE_URL'])
+    app.extensions['render_pool'] = render_pool
+
+    # With the Playwright engine every job opens a context in one shared browser,
+    # started when the first job needs it
+    playwright_lock = threading.Lock()
+
+    def playwright_browser():
+        """Return the app's Playwright browser, starting it on first use"""
+        with playwright_lock:
+            browser = app.extensions.get('playwright_browser')
+            if browser is None:
+                browser = PlaywrightBrowser()
+                app.extensions['playwright_browser'] = browser
+            return browser
+
+    # Optional Redis cache for scrape results and crawl dedup
+    redis_client = None
+    if app.config['REDIS_URL']:
+        redis_client = redis.Redis.from_url(app.config['REDIS_URL'])
+    app.extensions['redis'] = redis_client
+
+    # Conditional-GET cache so unchanged pages are not downloaded again
+    http_cache = None
+    if app.config['HTTP_CACHE_FILE']:
+        _ensure_dir(os.path.dirname(app.config['HTTP_CACHE_FILE']))
+        http_cache = HTTPCache(app.config['HTTP_CACHE_FILE'], ttl=app.config['HTTP_CACHE_TTL'])
+    app.extensions['http_cache'] = http_cache
 
     @app.route('/')
     def index():
-        """Render the main page"""
+        """Render the main page (nginx serves the pre-rendered copy in production)"""
         app.logger.info('Rendering index page')
         return render_template('index.html')
 
-    @app.route('/scrape', methods=['POST'])
-    def scrape():
-        """Handle scraping requests"""
-        try:
-            # Get form data
-            url = request.form.get('url', '').strip()
-            is_sitemap = request.form.get('is_sitemap') == 'on'
-            use_selenium = request.form.get('use_selenium') == 'on'
-            
-            # Parse selectors
-            try:
-                selectors = json.loads(request.form.get('selectors', '{}'))
-            except json.JSONDecodeError:
-                app.logger.error("Invalid selectors format")
-                return jsonify({
-                    'error': 'Invalid selectors format. Please enter HTML tags in the format "key: tag", one per line.'
-                }), 400
+    @app.cli.command('render-index')
+    def render_index():
+        """Pre-render the main page into the static folder for nginx to serve."""
+        with app.test_request_context('/'):
+            html = render_template('index.html')
+        os.makedirs(app.static_folder, exist_ok=True)
+        path = os.path.join(app.static_folder, 'index.html')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(html)
+        # Compressed copy for nginx's gzip_static
+        with gzip.open(path + '.gz', 'wt', encoding='utf-8') as f:
+            f.write(html)
+        click.echo(f'Rendered {path}')
 
-            if not url:
-                app.logger.error("No URL provided")
-                return jsonify({
-                    'error': 'Please enter a URL'
-                }), 400
+    @app.after_request
+    def no_store_scrape_responses(response):
+        """Keep browsers from caching scrape results, which change between runs"""
+        if request.path.startswith('/scrape'):
+            response.headers['Cache-Control'] = 'no-store'
+        return response
 
-            # Get crawling options
-            is_crawl = request.form.get('is_crawl') == 'on'
-            max_pages = int(request.form.get('max_pages', 100))
-            same_domain_only = request.form.get('same_domain_only') == 'on'
-            wait_time = int(request.form.get('wait_time', 0))
+    # Worker processes that parse batch-fetched pages in parallel
+    parse_pool = ProcessPool(app.config['PARSE_WORKERS'])
+    app.extensions['parse_pool'] = parse_pool
 
-            # Validate max_pages
-            if max_pages > 100:
-                app.logger.warning(f"Max pages reduced from {max_pages} to 100 for performance")
-                max_pages = 100
+    # Scrapes run on background threads so the request thread is freed at once
+    scrape_pool = ThreadPoolExecutor(max_workers=app.config['SCRAPE_WORKERS'])
+    app.extensions['scrape_pool'] = scrape_pool
+    # Job state is kept on disk, so any worker process can report on any job
+    job_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'jobs')
+    _ensure_dir(job_dir)
 
-            app.logger.info(f"Starting scrape for URL: {url}")
-            app.logger.debug(f"Selectors: {selectors}")
-            app.logger.debug(f"Options: sitemap={is_sitemap}, crawl={is_crawl}, max_pages={max_pages}, same_domain_only={same_domain_only}, wait_time={wait_time}")
+    def job_file(job_id):
+        """Return the state file of a job, or None if job_id is not a valid name"""
+        return safe_join(job_dir, job_id + '.json')
+
+    def crawl_visited_set():
+        """Return a Redis visited set for a crawl, or None to use a local one"""
+        if redis_client is None:
+            return None
+        try:
+            return RedisVisitedSet(redis_client, f'crawl:{uuid.uuid4().hex}:visited',
+                                   ttl=app.config['SCRAPE_CACHE_TTL'])
+        except redis.RedisError as e:
+            app.logger.warning(f"Redis dedup unavailable, using a local visited set: {str(e)}")
+            return None
+
+    def run_scrape(url, selectors, options, filename, download_url, preview_url, cache_key):
+        """Run a scrape job and return its JSON payload and HTTP status"""
+        driver = None
+        scraper = None
+
+        try:
+            # Selenium crawls render on the browser processes of the render pool if
+            # there is one; otherwise borrow a WebDriver rather than starting Chrome
+            # Playwright renders in a context of the app's browser, crawl pages in tabs
+            playwright = app.config['BROWSER_ENGINE'] == 'playwright'
+            crawl_pool = render_pool if options['use_selenium'] and options['is_crawl'] and not playwright else None
+            if options['use_selenium'] and crawl_pool is None and not playwright:
+                driver = driver_pool.acquire()
 
             # Initialize scraper
             scraper = WebScraper(
-                use_selenium=use_selenium,
-                debug=app.debug
+                use_selenium=options['use_selenium'],
+                debug=app.debug,
+                concurrency=app.config['SCRAPE_CONCURRENCY'],
+                driver=driver,
+                http_cache=http_cache,
+                parse_pool=parse_pool,
+                rate_limit=app.config['CRAWL_RATE_LIMIT'],
+                parallel=max(app.config['SELENIUM_CRAWL_WORKERS'], 1) if crawl_pool or playwright else 1,
+                render_pool=crawl_pool,
+                engine=app.config['BROWSER_ENGINE'],
+                browser=playwright_browser() if options['use_selenium'] and playwright else None
             )
 
-            try:
+            # Results are written to file as they are scraped
+            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+
+            with _JSONArrayWriter(filepath) as writer:
                 # Scrape data
-                if is_sitemap:
+                if options['is_sitemap']:
                     app.logger.info("Scraping from sitemap")
-                    data = scraper.scrape_sitemap(url, selectors)
-                elif is_crawl:
+                    scraper.scrape_sitemap(url, selectors, on_item=writer.write)
+                elif options['is_crawl']:
                     app.logger.info("Crawling website")
+                    visited = crawl_visited_set()
                     if selectors:
-                        data = scraper.crawl_and_scrape(url, selectors, max_pages, same_domain_only, wait_time)
+                        scraper.crawl_and_scrape(url, selectors, options['max_pages'], options['same_domain_only'],
+                                                 options['wait_time'], on_item=writer.write, visited=visited)
                     else:
-                        data = scraper.crawl_website(url, max_pages, same_domain_only)
+                        scraper.crawl_website(url, options['max_pages'], options['same_domain_only'],
+                                              on_item=writer.write, visited=visited)
                 else:
                     app.logger.info("Scraping single page")
                     if selectors:
-                        data = scraper.scrape_page(url, selectors)
+                        for item in scraper.scrape_page(url, selectors):
+                            writer.write(item)
                     else:
                         soup = scraper.scrape(url)
-                        data = [{
+                        writer.write({
                             'url': url,
                             'title': soup.title.string if soup.title else None,
                             'links': [a.get('href') for a in soup.find_all('a', href=True)]
-                        }]
-
-                if not data:
-                    app.logger.warning("No data found")
-                    return jsonify({
-                        'error': 'No data found'
-                    }), 404
-
-                # Save results to file
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                filename = f'scraped_data_{timestamp}.json'
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                
-                with open(filepath, 'w') as f:
-                    json.dump(data, f, indent=2)
-
-                app.logger.info(f"Successfully scraped {len(data)} items")
-                return jsonify({
-                    'success': True,
-                    'message': f'Successfully scraped {len(data)} items',
-                    'data': data,
-                    'download_url': url_for('download_file', filename=filename)
-                })
-
-            except ScrapingError as e:
-                app.logger.error(f"Scraping error: {str(e)}")
-                return jsonify({
-                    'error': str(e)
-                }), 400
-            except Exception as e:
-                app.logger.error(f"Unexpected error during scraping: {str(e)}")
-                app.logger.debug(traceback.format_exc())
-                return jsonify({
-                    'error': f'An unexpected error occurred during scraping: {str(e)}'
-                }), 500
-            finally:
+                        })
+
+            if not writer.count:
+                os.remove(filepath)
+                app.logger.warning("No data found")
+                return {
+                    'error': 'No data found'
+                }, 404
+
+            app.logger.info(f"Successfully scraped {writer.count} items")
+            response = {
+                'success': True,
+                'message': f'Successfully scraped {writer.count} items',
+                'count': writer.count,
+                'download_url': download_url,
+                'preview_url': preview_url
+            }
+            if cache_key:
+                try:
+                    redis_client.setex(cache_key, app.config['SCRAPE_CACHE_TTL'],
+                                       orjson.dumps({'filename': filename, 'response': response}))
+                except redis.RedisError as e:
+                    app.logger.warning(f"Cache update failed: {str(e)}")
+            return response, 200
+
+        except ScrapingError as e:
+            app.logger.error(f"Scraping error: {str(e)}")
+            return {
+                'error': str(e)
+            }, 400
+        except Exception as e:
+            app.logger.error(f"Unexpected error during scraping: {str(e)}")
+            app.logger.debug('Exception details', exc_info=True)
+            return {
+                'error': f'An unexpected error occurred during scraping: {str(e)}'
+            }, 500
+        finally:
+            if scraper:
                 scraper.close()
+            if driver:
+                driver_pool.release(driver)
+
+    def run_job(filepath, *args):
+        """Run a scrape job and record its result for the status and result routes"""
+        payload, status = run_scrape(*args)
+        try:
+            _write_job(filepath, {'done': True, 'status': status, 'payload': payload})
+        except OSError as e:
+            app.logger.error(f"Failed to record job result: {str(e)}")
+
+    @app.route('/scrape', methods=['POST'])
+    def scrape():
+        """Handle scraping requests by starting a background scrape job"""
+        try:
+            # Validate the form before any scraper work starts
+            try:
+                scrape_request = ScrapeRequest.from_form(request.form)
+            except ValueError as e:
+                app.logger.error(f"Invalid scrape request: {str(e)}")
+                return _bad_request(e)
+
+            url = str(scrape_request.url)
+            selectors = scrape_request.selectors
+            options = scrape_request.model_dump(exclude={'url', 'selectors'})
+
+            # Serve repeated scrapes from the cache while their results file exists
+            cache_key = None
+            if redis_client is not None:
+                cache_key = _scrape_cache_key(url, selectors, options)
+                try:
+                    cached = redis_client.get(cache_key)
+                except redis.RedisError as e:
+                    app.logger.warning(f"Cache lookup failed: {str(e)}")
+                    cached = None
+                if cached:
+                    cached = orjson.loads(cached)
+                    if os.path.isfile(os.path.join(app.config['UPLOAD_FOLDER'], cached['filename'])):
+                        app.logger.info(f"Serving cached results for URL: {url}")
+                        return _json_response(cached['response'])
+
+            app.logger.info(f"Starting scrape for URL: {url}")
+            app.logger.debug(f"Selectors: {selectors}")
+            app.logger.debug(f"Options: {options}")
+
+            job_id = uuid.uuid4().hex
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f'scraped_data_{timestamp}_{job_id[:8]}.json'
+            _prune_jobs(job_dir, app.config['JOB_TTL'])
+            filepath = job_file(job_id)
+            _write_job(filepath, {'done': False, 'pid': os.getpid()})
+            scrape_pool.submit(
+                run_job, filepath, url, selectors, options, filename,
+                app.config['DOWNLOAD_URL_PREFIX'] + filename,
+                app.config['PREVIEW_URL_PREFIX'] + filename,
+                cache_key
+            )
+            return jsonify({
+                'job_id': job_id,
+                'status_url': url_for('scrape_status', job_id=job_id),
+                'result_url': url_for('scrape_result', job_id=job_id)
+            }), 202
 
         except Exception as e:
             app.logger.error(f"Error in scrape route: {str(e)}")
-            app.logger.debug(traceback.format_exc())
+            app.logger.debug('Exception details', exc_info=True)
             return jsonify({
                 'error': 'An unexpected error occurred'
             }), 500
 
-    @app.route('/download/<filename>')
+    @app.route('/scrape/status/<job_id>')
+    def scrape_status(job_id):
+        """Report whether a scrape job has finished"""
+        filepath = job_file(job_id)
+        job = _read_job(filepath, app.config['JOB_TTL']) if filepath else None
+        if job is None:
+            return jsonify({
+                'error': 'Job not found'
+            }), 404
+        return jsonify({
+            'done': job['done']
+        })
+
+    @app.route('/scrape/result/<job_id>')
+    def scrape_result(job_id):
+        """Return the result of a finished scrape job"""
+        filepath = job_file(job_id)
+        job = _read_job(filepath, app.config['JOB_TTL']) if filepath else None
+        if job is None:
+            return jsonify({
+                'error': 'Job not found'
+            }), 404
+        if not job['done']:
+            return jsonify({
+                'done': False
+            }), 202
+        try:
+            os.remove(filepath)
+        except FileNotFoundError:
+            pass
+        return _json_response(job['payload'], job['status'])
+
+    @app.route('/scrape/stream')
+    def scrape_stream():
+        """Crawl a website, streaming each page to the client as a Server-Sent Event"""
+        try:
+            scrape_request = ScrapeRequest.from_form(request.args)
+        except ValueError as e:
+            return _bad_request(e)
+        url = str(scrape_request.url)
+        selectors = scrape_request.selectors
+        max_pages = scrape_request.max_pages
+        same_domain_only = scrape_request.same_domain_only
+
+        app.logger.info(f"Starting streamed crawl for URL: {url}")
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filename = f'scraped_data_{timestamp}_{uuid.uuid4().hex[:8]}.json'
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        download_url = app.config['DOWNLOAD_URL_PREFIX'] + filename
+        events = queue.Queue()
+        stop = threading.Event()
+
+        def crawl():
+            scraper = None
+            try:
+                scraper = WebScraper(debug=app.debug, concurrency=app.config['SCRAPE_CONCURRENCY'],
+                                     http_cache=http_cache, parse_pool=parse_pool,
+                                     rate_limit=app.config['CRAWL_RATE_LIMIT'])
+                visited = crawl_visited_set()
+                with _JSONArrayWriter(filepath) as writer:
+                    def on_item(item):
+                        writer.write(item)
+                        events.put(('message', item))
+                    run_async(scraper.acrawl(url, selectors, max_pages, same_domain_only,
+                                             on_item=on_item, visited=visited, stop_event=stop))
+                if writer.count:
+                    events.put(('done', {
+                        'success': True,
+                        'message': f'Successfully scraped {writer.count} items',
+                        'count': writer.count,
+                        'download_url': download_url
+                    }))
+                else:
+                    os.remove(filepath)
+                    events.put(('error', {'error': 'No data found'}))
+            except Exception as e:
+                app.logger.error(f"Unexpected error during streamed crawl: {str(e)}")
+                app.logger.debug('Exception details', exc_info=True)
+                events.put(('error', {'error': f'An unexpected error occurred during scraping: {str(e)}'}))
+            finally:
+                if scraper:
+                    scraper.close()
+
+        def generate():
+            try:
+                while True:
+                    event, payload = events.get()
+                    data = orjson.dumps(payload).decode()
+                    if event == 'message':
+                        yield f'data: {data}\n\n'
+                    else:
+                        yield f'event: {event}\ndata: {data}\n\n'
+                        break
+            finally:
+                # Runs when the stream ends or the client disconnects
+                stop.set()
+
+        threading.Thread(target=crawl, daemon=True).start()
+        return Response(generate(), mimetype='text/event-stream',
+                        headers={'X-Accel-Buffering': 'no'})
+
+    @app.route(app.config['DOWNLOAD_URL_PREFIX'] + '<filename>')
     def download_file(filename):
         """Handle file downloads"""
         try:
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            if not os.path.exists(filepath):
+            filepath = safe_join(app.config['UPLOAD_FOLDER'], filename)
+            if not filepath or not os.path.isfile(filepath):
                 app.logger.error(f"File not found: {filename}")
                 return jsonify({
                     'error': 'File not found'
                 }), 404
-            
-            return send_file(
-                filepath,
+
+            # Behind nginx, hand the transfer to its internal /downloads location
+            accel_prefix = app.config['X_ACCEL_REDIRECT_PREFIX']
+            if accel_prefix:
+                response = app.response_class(mimetype='application/json')
+                response.headers['X-Accel-Redirect'] = accel_prefix + filename
+                response.headers.set('Content-Disposition', 'attachment', filename=filename)
+                return response
+
+            return send_from_directory(
+                os.path.abspath(app.config['UPLOAD_FOLDER']),
+                filename,
                 as_attachment=True,
-                download_name=filename
+                download_name=filename,
+                conditional=True,
+                max_age=0
             )
         except Exception as e:
             app.logger.error(f"Download error: {str(e)}")
@@ -170,6 +640,33 @@ def create_app(config_name='default'):
                 'error': 'Failed to download file'
             }), 500
 
+    @app.route(app.config['PREVIEW_URL_PREFIX'] + '<filename>')
+    def preview_file(filename):
+        """Return the first records of a results file for display"""
+        try:
+            filepath = safe_join(app.config['UPLOAD_FOLDER'], filename)
+            if not filepath or not os.path.isfile(filepath):
+                app.logger.error(f"File not found: {filename}")
+                return jsonify({
+                    'error': 'File not found'
+                }), 404
+
+            limit = request.args.get('limit', 20, type=int)
+            limit = max(1, min(limit, 100))
+            return _json_response({
+                'data': _read_records(filepath, limit)
+            })
+        except orjson.JSONDecodeError:
+            app.logger.error(f"File cannot be previewed: {filename}")
+            return jsonify({
+                'error': 'File cannot be previewed'
+            }), 400
+        except Exception as e:
+            app.logger.error(f"Preview error: {str(e)}")
+            return jsonify({
+                'error': 'Failed to preview file'
+            }), 500
+
     @app.errorhandler(404)
     def not_found_error(error):
         """Handle 404 errors"""
@@ -183,7 +680,7 @@ def create_app(config_name='default'):
     def internal_error(error):
         """Handle 500 errors"""
         app.logger.error(f'Server error: {str(error)}')
-        app.logger.debug(traceback.format_exc())
+        app.logger.debug('Exception details', exc_info=True)
         return jsonify({
             'error': 'Internal server error',
             'details': str(error)
@@ -192,5 +689,8 @@ def create_app(config_name='default'):
     return app
 
 if __name__ == '__main__':
+    from gevent.pywsgi import WSGIServer
+
     app = create_app(os.environ.get('FLASK_ENV', 'development'))
-    app.run(host='127.0.0.1', port=9000) 
\ No newline at end of file
+    app.logger.info('Serving on http://127.0.0.1:3000')
+    WSGIServer(('127.0.0.1', 3000), app).serve_forever()
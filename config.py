@@ -7,6 +7,25 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     LOG_LEVEL = 'INFO'
     LOG_FILE = 'logs/app.log'
+    HTTP_CACHE_FILE = 'logs/httpcache.db'  # Conditional-GET cache; disabled when None
+    HTTP_CACHE_TTL = 7 * 24 * 3600  # Seconds a cached response is revalidated against before it is dropped
+    SCRAPE_WORKERS = 16  # Scrape jobs run at once per process
+    SCRAPE_CONCURRENCY = 20  # Max in-flight requests when fetching sitemap/crawl pages
+    CRAWL_RATE_LIMIT = 5.0  # Max requests per second to any one host; None for no limit
+    PARSE_WORKERS = os.cpu_count()  # Processes parsing fetched sitemap/crawl pages
+    SELENIUM_POOL_SIZE = 4  # Max headless Chrome instances kept per process
+    SELENIUM_MAX_USES = 50  # Scrapes before a pooled driver is recycled
+    SELENIUM_CRAWL_WORKERS = 0  # Browser processes rendering Selenium crawls in parallel; off below 2
+    BROWSER_ENGINE = os.environ.get('BROWSER_ENGINE', 'selenium')  # 'selenium', or 'playwright' for JS rendering
+    SELENIUM_REMOTE_URL = os.environ.get('SELENIUM_REMOTE_URL')  # e.g. http://localhost:4444/wd/hub; local Chrome when unset
+    REDIS_URL = os.environ.get('REDIS_URL')  # Result cache and crawl dedup; disabled when unset
+    SCRAPE_CACHE_TTL = 3600  # Seconds a cached scrape result is served
+    JOB_TTL = 3600  # Seconds the state of an uncollected scrape job is kept
+    # URL prefixes of results files; links are built by concatenation, which is
+    # safe because result filenames are generated by the app
+    DOWNLOAD_URL_PREFIX = '/download/'
+    PREVIEW_URL_PREFIX = '/preview/'
+    X_ACCEL_REDIRECT_PREFIX = None  # nginx internal location serving UPLOAD_FOLDER, if any
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -20,11 +39,14 @@ class ProductionConfig(Config):
     # Add production-specific settings
     SECRET_KEY = os.environ.get('SECRET_KEY')  # Must be set in production
     LOG_LEVEL = 'WARNING'
+    X_ACCEL_REDIRECT_PREFIX = '/downloads/'  # Matches the internal location in nginx.conf
 
 class TestingConfig(Config):
     """Testing configuration."""
     DEBUG = True
     TESTING = True
+    REDIS_URL = None
+    HTTP_CACHE_FILE = None
 
 # Configuration dictionary
 config = {
@@ -0,0 +1,61 @@
+from typing import Dict, Mapping, Union
+import orjson
+from pydantic import BaseModel, Field, HttpUrl, ValidationError, field_validator
+from typing_extensions import NotRequired, TypedDict
+
+MAX_PAGES = 100  # Upper bound on pages per crawl, for performance
+
+class SelectorSpec(TypedDict):
+    """A selector with an explicit choice of extracting every match or only the first."""
+    selector: str
+    multi: NotRequired[bool]
+
+class ScrapeRequest(BaseModel):
+    """Options of a scrape request, validated from the submitted form."""
+    url: HttpUrl
+    selectors: Dict[str, Union[str, SelectorSpec]] = {}
+    is_sitemap: bool = False
+    is_crawl: bool = False
+    use_selenium: bool = False
+    max_pages: int = Field(MAX_PAGES, ge=1)
+    # Unchecked checkboxes are not submitted, so flags default to off
+    same_domain_only: bool = False
+    wait_time: int = Field(0, ge=0, le=60)
+
+    @field_validator('max_pages')
+    @classmethod
+    def cap_max_pages(cls, value: int) -> int:
+        """Reduce max_pages to MAX_PAGES rather than rejecting larger values."""
+        return min(value, MAX_PAGES)
+
+    @classmethod
+    def from_form(cls, form: Mapping[str, str]) -> 'ScrapeRequest':
+        """
+        Validate submitted form fields, where selectors are a JSON object.
+        
+        Args:
+            form (Mapping): The submitted fields; blank fields take their defaults
+            
+        Returns:
+            ScrapeRequest: The validated request
+            
+        Raises:
+            ValueError: If the selectors are not valid JSON
+            ValidationError: If any field is invalid
+        """
+        values = {key: value.strip() for key, value in form.items() if value.strip()}
+        try:
+            values['selectors'] = orjson.loads(values.get('selectors', '{}'))
+        except orjson.JSONDecodeError:
+            raise ValueError('Invalid selectors format. Please enter HTML tags in the format "key: tag", one per line.')
+        return cls.model_validate(values)
+
+def validation_error_message(error: ValidationError) -> str:
+    """Summarize a validation error as a single user-facing message."""
+    problems = []
+    for detail in error.errors():
+        field = '.'.join(str(part) for part in detail['loc'])
+        if field == 'url' and detail['type'] == 'missing':
+            return 'Please enter a URL'
+        problems.append(f"{field}: {detail['msg']}")
+    return 'Invalid scrape request: ' + '; '.join(problems)
@@ -1,22 +1,53 @@
+import asyncio
+import aiohttp
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.dammit import EncodingDetector
+from lxml import etree
+try:
+    from cssselect import HTMLTranslator, SelectorError as CSSSelectorError
+except ImportError:
+    HTMLTranslator = None
+from pybloom_live import ScalableBloomFilter
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.common.exceptions import TimeoutException, WebDriverException, JavascriptException
 from webdriver_manager.chrome import ChromeDriverManager
 from fake_useragent import UserAgent
-import json
+try:
+    from playwright.async_api import async_playwright, Error as PlaywrightError
+except ImportError:
+    async_playwright = None
+import codecs
+import gzip
+import itertools
+import orjson
 import time
-from typing import Optional, Dict, Any, Union, List
+from typing import Optional, Dict, Any, Union, List, Callable, Tuple, Iterator
 import logging
-from urllib.parse import urlparse, urljoin
-import traceback
+import multiprocessing.util
+from urllib.parse import urlparse, urljoin, urlencode, parse_qsl
 import platform
 import os
+import queue
+import random
+import re
+import redis
+import socket
+import sqlite3
+import threading
+import zlib
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
+from functools import lru_cache
 
 class ScraperError(Exception):
     """Base exception for scraper errors"""
@@ -38,32 +69,1083 @@ class SeleniumError(ScraperError):
     """Raised when Selenium operations fail"""
     pass
 
+# Connect and read timeouts for plain HTTP requests
+REQUEST_TIMEOUT = (5, 30)
+
+# Seconds Selenium form logins wait for the form and then for the login to complete
+AUTH_WAIT_TIMEOUT = 10
+
+# One connection pool shared by every WebScraper in the process, so keep-alive
+# connections (and their TLS sessions) are reused across scrapes. Each scraper
+# still has its own Session, keeping cookies and auth separate.
+_HTTP_ADAPTER = HTTPAdapter(
+    pool_connections=50,
+    pool_maxsize=200,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      raise_on_status=False)
+)
+
+_CHARSET_PARAM = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+def _header_charset(content_type: Optional[str]) -> Optional[str]:
+    """The charset parameter of a Content-Type header, if it has one."""
+    match = _CHARSET_PARAM.search(content_type or '')
+    return match.group(1) if match else None
+
+def _decode_body(body: bytes, charset: Optional[str]) -> Union[str, bytes]:
+    """
+    Decode a page with the charset its Content-Type header declares.
+    
+    Without one the bytes are returned as they are, so the page's own BOM or
+    <meta charset> can decide, and otherwise _page_encoding rather than a
+    character detection pass of requests or aiohttp over the whole body.
+    """
+    if charset:
+        try:
+            return body.decode(charset, errors='replace')
+        except LookupError:
+            pass
+    return body
+
+def _cache_body(html: Union[str, bytes]) -> bytes:
+    """The bytes to store in the HTTP cache for a page; decoded pages are stored as UTF-8."""
+    return html.encode('utf-8') if isinstance(html, str) else html
+
+def _cached_page(body: bytes) -> Union[str, bytes]:
+    """
+    A page from the HTTP cache. Pages decoded with the header's charset were
+    stored as UTF-8 and the header is not resent on 304, so UTF-8 bodies are
+    decoded here; any other body is left for the parser to detect.
+    """
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError:
+        return body
+
+# Seconds resolved host addresses are reused by the async fetchers
+DNS_CACHE_TTL = 300
+
+# Addresses resolved by any crawl, keyed by (host, port, family), so a crawl
+# does not look up hosts again that an earlier one in the process resolved
+_DNS_CACHE = {}
+_DNS_CACHE_LOCK = threading.Lock()
+
+class _SharedDNSResolver(aiohttp.ThreadedResolver):
+    """aiohttp resolver that keeps its results in the process-wide DNS cache."""
+
+    async def resolve(self, hostname: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        key = (hostname, port, family)
+        now = time.monotonic()
+        with _DNS_CACHE_LOCK:
+            entry = _DNS_CACHE.get(key)
+        if entry and entry[0] > now:
+            return list(entry[1])
+        hosts = await super().resolve(hostname, port, family)
+        with _DNS_CACHE_LOCK:
+            if len(_DNS_CACHE) >= 1024:
+                # Forget expired hosts so the cache does not grow without bound
+                for stale in [k for k, (expires, _) in _DNS_CACHE.items() if expires <= now]:
+                    del _DNS_CACHE[stale]
+            _DNS_CACHE[key] = (now + DNS_CACHE_TTL, hosts)
+        return list(hosts)
+
+# Event loop that runs every async fetch and crawl in the process
+_LOOP = None
+_LOOP_LOCK = threading.Lock()
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """Return the shared event loop, starting its thread on first use."""
+    global _LOOP
+    with _LOOP_LOCK:
+        if _LOOP is None:
+            # Under gevent the thread is a greenlet, so the loop waits on the hub
+            # alongside the requests instead of each job running a loop of its
+            # own, which asyncio refuses in a thread that already has one running
+            ready = threading.Event()
+            loops = []
+
+            def run():
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                loops.append(loop)
+                ready.set()
+                loop.run_forever()
+
+            threading.Thread(target=run, name='asyncio', daemon=True).start()
+            ready.wait()
+            _LOOP = loops[0]
+        return _LOOP
+
+def run_async(coro) -> Any:
+    """
+    Run a coroutine on the shared background event loop and wait for its result.
+    
+    Unlike asyncio.run this can be called from any number of threads or
+    greenlets at once, and they all share one loop.
+    
+    Args:
+        coro: The coroutine to run
+        
+    Returns:
+        Any: The coroutine's result; an exception it raises is re-raised
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _background_loop()).result()
+
+# Number of User-Agents a scraper rotates through
+_USER_AGENT_POOL_SIZE = 32
+
+@lru_cache(maxsize=1)
+def _user_agent_pool() -> Tuple[str, ...]:
+    """Pick the User-Agents to rotate through, loading fake_useragent's data once per process."""
+    ua = UserAgent()
+    return tuple(dict.fromkeys(ua.random for _ in range(_USER_AGENT_POOL_SIZE)))
+
+@lru_cache(maxsize=256)
+def _compile_selector(selector: str) -> soupsieve.SoupSieve:
+    """Compile a CSS selector once so it is reused across pages and requests."""
+    return soupsieve.compile(selector)
+
+# Data keys mapped to CSS selector strings or selectors already compiled with
+# soupsieve, or to a {'selector': ..., 'multi': bool} spec where multi=False
+# extracts only the first match
+Selectors = Dict[str, Union[str, soupsieve.SoupSieve, Dict[str, Any]]]
+
+# A lone ID selector matches at most one element in a valid page
+_ID_SELECTOR = re.compile(r'#[\w-]+')
+
+def _selector_spec(spec: Union[str, soupsieve.SoupSieve, Dict[str, Any]]) -> Tuple[Union[str, soupsieve.SoupSieve], bool]:
+    """
+    Split a value of a selectors dict into its selector and whether every match is
+    wanted. Unless multi is given, ID selectors such as '#title' are single.
+    """
+    multi = None
+    if isinstance(spec, dict):
+        multi = spec.get('multi')
+        spec = spec['selector']
+    if multi is None:
+        pattern = spec.pattern if isinstance(spec, soupsieve.SoupSieve) else spec
+        multi = not _ID_SELECTOR.fullmatch(pattern.strip())
+    return spec, multi
+
+def _extract_data(soup: BeautifulSoup, selectors: Selectors) -> Dict[str, Any]:
+    """Extract data from a parsed page; see WebScraper.extract_data."""
+    if not selectors:
+        raise SelectorError("No selectors provided")
+
+    logger = logging.getLogger(__name__)
+    data = {}
+    for key, selector in selectors.items():
+        try:
+            selector, multi = _selector_spec(selector)
+            if isinstance(selector, soupsieve.SoupSieve):
+                compiled, selector = selector, selector.pattern
+            else:
+                # Compiled once per selector string
+                compiled = _compile_selector(selector)
+            logger.debug(f'Extracting data for key: {key} with selector: {selector}')
+            if multi:
+                # Find all elements matching the selector
+                elements = compiled.select(soup)
+            else:
+                # Stop at the first match
+                element = compiled.select_one(soup)
+                elements = [element] if element is not None else []
+            
+            if elements:
+                if len(elements) == 1:
+                    # For single elements, get text and href if it's a link
+                    element = elements[0]
+                    if element.name == 'a' and element.get('href'):
+                        data[key] = f"{element.get_text(strip=True)} ({element['href']})"
+                    elif element.name == 'img' and element.get('src'):
+                        data[key] = f"Image: {element['src']}"
+                    else:
+                        data[key] = element.get_text(strip=True)
+                else:
+                    # For multiple elements, get text and href for each
+                    data[key] = []
+                    for element in elements:
+                        if element.name == 'a' and element.get('href'):
+                            data[key].append(f"{element.get_text(strip=True)} ({element['href']})")
+                        elif element.name == 'img' and element.get('src'):
+                            data[key].append(f"Image: {element['src']}")
+                        else:
+                            data[key].append(element.get_text(strip=True))
+                logger.debug(f'Successfully extracted data for {key}')
+            else:
+                logger.warning(f'No elements found for selector: {selector}')
+                data[key] = None
+        except Exception as e:
+            error_msg = f"Failed to extract {key}: {str(e)}"
+            logger.error(error_msg)
+            logger.debug('Exception details', exc_info=True)
+            raise SelectorError(error_msg)
+    return data
+
+@lru_cache(maxsize=256)
+def _compile_xpath(selector: str) -> Optional[etree.XPath]:
+    """
+    Translate a CSS selector to a compiled XPath expression once.
+    
+    Returns:
+        etree.XPath: The expression, or None if cssselect is not installed or
+        cannot express the selector (e.g. soupsieve's :-soup-contains)
+    """
+    if HTMLTranslator is None:
+        return None
+    try:
+        return etree.XPath(HTMLTranslator().css_to_xpath(selector))
+    except (CSSSelectorError, etree.XPathSyntaxError):
+        return None
+
+# Tags whose strings BeautifulSoup leaves out of an enclosing tag's get_text()
+_NON_TEXT_TAGS = frozenset(['script', 'style', 'template', 'rt', 'rp'])
+
+def _element_text(element: etree._Element) -> str:
+    """Text of an lxml element as BeautifulSoup's get_text(strip=True) returns it."""
+    parts = []
+
+    def walk(node):
+        if node.text:
+            parts.append(node.text.strip())
+        for child in node:
+            # Comments and processing instructions have a non-string tag
+            if isinstance(child.tag, str) and child.tag not in _NON_TEXT_TAGS:
+                walk(child)
+            if child.tail:
+                parts.append(child.tail.strip())
+
+    walk(element)
+    return ''.join(parts)
+
+def _element_value(element: etree._Element) -> str:
+    """The value _extract_data records for a matched element."""
+    if element.tag == 'a' and element.get('href'):
+        return f"{_element_text(element)} ({element.get('href')})"
+    if element.tag == 'img' and element.get('src'):
+        return f"Image: {element.get('src')}"
+    return _element_text(element)
+
+# Byte order marks, from which libxml2 detects a page's encoding itself
+_BOMS = (codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+def _page_encoding(html: bytes) -> Optional[str]:
+    """
+    The encoding to read a page's bytes with when the page does not declare one
+    with a BOM or <meta charset>: UTF-8 if they are valid UTF-8, else Latin-1.
+    None if the page declares its encoding, for the parser to honour.
+    
+    Both the lxml and the BeautifulSoup paths decode with this, so they agree on
+    a page, and BeautifulSoup never runs character detection over the body.
+    """
+    if html.startswith(_BOMS) or EncodingDetector.find_declared_encoding(html, is_html=True) is not None:
+        return None
+    try:
+        html.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def _make_soup(html: Union[str, bytes], parser: str = 'lxml',
+               parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """Parse a page with BeautifulSoup, reading undeclared bytes as _page_encoding says."""
+    from_encoding = _page_encoding(html) if isinstance(html, bytes) else None
+    return BeautifulSoup(html, parser, parse_only=parse_only, from_encoding=from_encoding)
+
+def _parse_html(html: Union[str, bytes]) -> Optional[etree._Element]:
+    """Parse a page into a plain lxml tree; None if the document is empty."""
+    if isinstance(html, str):
+        # lxml rejects str with an encoding declaration, so parse the UTF-8 bytes
+        return etree.fromstring(html.encode('utf-8'), etree.HTMLParser(encoding='utf-8'))
+    return etree.fromstring(html, etree.HTMLParser(encoding=_page_encoding(html)))
+
+def _extract_data_lxml(html: Union[str, bytes], selectors: Selectors) -> Optional[Dict[str, Any]]:
+    """
+    Extract data as _extract_data does, evaluating compiled XPath on an lxml tree
+    instead of building a BeautifulSoup tree and matching CSS on it.
+    
+    Returns:
+        dict: The extracted data, or None if any selector cannot be translated to
+        XPath or the page does not parse, so the caller can fall back to _extract_data
+    """
+    if not selectors:
+        return None
+    compiled = {}
+    for key, spec in selectors.items():
+        selector, multi = _selector_spec(spec)
+        if isinstance(selector, soupsieve.SoupSieve):
+            selector = selector.pattern
+        compiled[key] = (selector, _compile_xpath(selector), multi)
+        if compiled[key][1] is None:
+            return None
+
+    root = _parse_html(html)
+    if root is None:
+        return None
+
+    logger = logging.getLogger(__name__)
+    data = {}
+    for key, (selector, xpath, multi) in compiled.items():
+        elements = xpath(root)
+        if not multi:
+            elements = elements[:1]
+        if not elements:
+            logger.warning(f'No elements found for selector: {selector}')
+            data[key] = None
+        elif len(elements) == 1:
+            data[key] = _element_value(elements[0])
+        else:
+            data[key] = [_element_value(element) for element in elements]
+    return data
+
+def _extract_page(html: Union[str, bytes], selectors: Selectors) -> Dict[str, Any]:
+    """
+    Extract data from a fetched page, on an lxml tree where the selectors allow it.
+    
+    Raises:
+        SelectorError: If the selectors are missing or invalid
+    """
+    data = _extract_data_lxml(html, selectors)
+    if data is None:
+        data = _extract_data(_make_soup(html), selectors)
+    return data
+
+def _parse_worker(args: Tuple[Union[str, bytes], Selectors]) -> Union[Dict[str, Any], Exception]:
+    """
+    Parse a page and extract data from it in a parse pool worker process.
+    
+    Args:
+        args (tuple): The page's HTML and the selectors to extract
+        
+    Returns:
+        dict: Extracted data, or the exception raised so one bad page does not
+        abort the rest of the batch
+    """
+    html, selectors = args
+    try:
+        return _extract_page(html, selectors)
+    except Exception as e:
+        return e
+
+# Entries kept by the URL parsing caches. Navigation links repeat on every page
+# of a site, so most links on a crawled page have been resolved before.
+_URL_CACHE_SIZE = 100_000
+
+_cached_urljoin = lru_cache(maxsize=_URL_CACHE_SIZE)(urljoin)
+_cached_urlparse = lru_cache(maxsize=_URL_CACHE_SIZE)(urlparse)
+
+# Links that never lead to another page
+_NON_PAGE_HREFS = ('#', 'mailto:', 'javascript:')
+
+# Link discovery only needs the title and the anchors, so only they are built into the tree
+_LINK_STRAINER = SoupStrainer(lambda name, attrs: name == 'title' or (name == 'a' and 'href' in attrs))
+
+def _page_links(soup: BeautifulSoup, page_url: str, base_domain: str,
+            same_domain_only: bool) -> List[str]:
+    """
+    Collect the crawlable links on a page.
+    
+    Args:
+        soup (BeautifulSoup): The parsed page
+        page_url (str): URL of the page, used to resolve relative links
+        base_domain (str): Domain of the crawl's start URL
+        same_domain_only (bool): Whether to drop links to other domains
+        
+    Returns:
+        List[str]: Absolute http(s) URLs of the links, in page order
+    """
+    hrefs = [link.get('href') for link in soup.find_all('a', href=True)]
+    return _resolve_links(hrefs, page_url, base_domain, same_domain_only)
+
+def _resolve_links(hrefs: List[str], page_url: str, base_domain: str,
+                   same_domain_only: bool) -> List[str]:
+    """Resolve a page's hrefs into its crawlable links; see _page_links."""
+    page_links = []
+    for href in hrefs:
+        if not href or href.startswith(_NON_PAGE_HREFS):
+            continue
+            
+        # Convert relative URLs to absolute
+        absolute_url = _cached_urljoin(page_url, href)
+        parsed_url = _cached_urlparse(absolute_url)
+        
+        # Skip if not same domain and same_domain_only is True
+        if same_domain_only and parsed_url.netloc != base_domain:
+            continue
+            
+        # Skip if not http/https
+        if parsed_url.scheme not in ['http', 'https']:
+            continue
+            
+        page_links.append(absolute_url)
+    return page_links
+
+def _parse_crawl_page(url: str, html: Union[str, bytes], selectors: Optional[Selectors],
+                      base_domain: str, same_domain_only: bool) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Parse a crawled page into its record and the links to follow from it.
+    
+    Args:
+        url (str): URL of the page
+        html (str): The page's HTML
+        selectors (dict): If given, the record holds the data extracted with these
+            CSS selectors instead of the page's title and links
+        base_domain (str): Domain of the crawl's start URL
+        same_domain_only (bool): Whether to drop links to other domains
+        
+    Returns:
+        tuple: The page's record, including its 'url', and its crawlable links
+    """
+    if selectors:
+        soup = _make_soup(html)
+        links = _page_links(soup, url, base_domain, same_domain_only)
+        return {'url': url, **_extract_data(soup, selectors)}, links
+
+    # The title and the links are collected in one walk over the anchors and titles
+    title = None
+    hrefs = []
+    root = _parse_html(html)
+    if root is not None:
+        seen_title = False
+        for element in root.iter('a', 'title'):
+            if element.tag == 'a':
+                hrefs.append(element.get('href'))
+            elif not seen_title:
+                # Only the first title counts, and only if it is plain text, as
+                # with soup.title.string
+                seen_title = True
+                title = element.text if len(element) == 0 else None
+    links = _resolve_links(hrefs, url, base_domain, same_domain_only)
+    item = {
+        'url': url,
+        'title': title,
+        'links': links,
+        'timestamp': datetime.now()
+    }
+    return item, links
+
+class HTTPCache:
+    """
+    SQLite store of response validators and bodies for conditional GETs.
+    
+    Responses that carry an ETag or Last-Modified header are stored with their
+    body compressed. Later requests for the same key send If-None-Match /
+    If-Modified-Since, and on 304 Not Modified the stored body is used instead
+    of downloading it again. The database runs in WAL mode so several worker
+    processes can share one file. Responses stored more than ttl seconds ago are
+    no longer used and are deleted as new ones are stored, so the file stays bounded.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600):
+        self.ttl = ttl
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('CREATE TABLE IF NOT EXISTS http(url TEXT PRIMARY KEY, etag TEXT, last_mod TEXT, '
+                               'body BLOB, stored_at REAL NOT NULL DEFAULT 0)')
+            columns = {row[1] for row in self._conn.execute('PRAGMA table_info(http)')}
+            if 'stored_at' not in columns:
+                # Caches from before eviction; their rows count as expired
+                self._conn.execute('ALTER TABLE http ADD COLUMN stored_at REAL NOT NULL DEFAULT 0')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS http_stored_at ON http(stored_at)')
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """
+        Look up a stored response.
+        
+        Returns:
+            tuple: The conditional request headers to send and the stored body,
+            or None if nothing is stored for key
+        """
+        with self._lock:
+            row = self._conn.execute('SELECT etag, last_mod, body FROM http WHERE url = ? AND stored_at >= ?',
+                                     (key, time.time() - self.ttl)).fetchone()
+        if row is None:
+            return None
+        etag, last_mod, body = row
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_mod:
+            headers['If-Modified-Since'] = last_mod
+        return headers, zlib.decompress(body)
+
+    def set(self, key: str, response_headers, body: bytes):
+        """Store body for key if the response headers carry a validator."""
+        etag = response_headers.get('ETag')
+        last_mod = response_headers.get('Last-Modified')
+        if not etag and not last_mod:
+            return
+        body = zlib.compress(body)
+        now = time.time()
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO http(url, etag, last_mod, body, stored_at) VALUES (?, ?, ?, ?, ?)',
+                               (key, etag, last_mod, body, now))
+            self._conn.execute('DELETE FROM http WHERE stored_at < ?', (now - self.ttl,))
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+@lru_cache(maxsize=_URL_CACHE_SIZE)
+def canonicalize_url(url: str) -> str:
+    """
+    Normalize a URL so different spellings of the same page compare equal.
+    
+    Lowercases the scheme and host, drops default ports, the fragment and any
+    trailing slash, and sorts the query parameters.
+    """
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    netloc = parsed.hostname or ''
+    if ':' in netloc:
+        netloc = f'[{netloc}]'  # IPv6 literal
+    try:
+        port = parsed.port
+    except ValueError:
+        port = None
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        netloc = f'{netloc}:{port}'
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    path = parsed.path.rstrip('/')
+    return f"{scheme}://{netloc}{path}" + (f"?{query}" if query else '')
+
+class VisitedSet:
+    """In-memory record of the canonical URLs a crawl has already queued."""
+
+    # Whether add_new does network I/O and so must be kept off the event loop
+    blocking = False
+
+    def __init__(self):
+        self._urls = set()
+
+    def add_new(self, urls: List[str]) -> List[str]:
+        """Record urls and return the ones that had not been seen before."""
+        new_urls = [url for url in dict.fromkeys(urls) if url not in self._urls]
+        self._urls.update(new_urls)
+        return new_urls
+
+class BloomVisitedSet(VisitedSet):
+    """
+    Crawl dedup set backed by a scalable Bloom filter.
+    
+    It takes a couple of bytes per URL however large the crawl grows, at the
+    cost of skipping the occasional unseen URL that collides (about error_rate
+    of them).
+    """
+
+    def __init__(self, initial_capacity: int = 10000, error_rate: float = 1e-4):
+        self._urls = ScalableBloomFilter(initial_capacity=initial_capacity, error_rate=error_rate,
+                                         mode=ScalableBloomFilter.LARGE_SET_GROWTH)
+
+    def add_new(self, urls: List[str]) -> List[str]:
+        # add() reports whether the URL was (probably) already present
+        return [url for url in dict.fromkeys(urls) if not self._urls.add(url)]
+
+class RedisVisitedSet(VisitedSet):
+    """
+    Crawl dedup set stored in a Redis set, so it lives outside the worker process.
+    
+    A URL is new when SADD reports it was added. The key is cleared when the set
+    is created and expires after ttl seconds. If Redis fails mid-crawl, the rest of
+    the crawl is deduplicated in memory; a URL queued before the failure may then
+    be queued once more.
+    """
+
+    blocking = True
+
+    def __init__(self, client, key: str, ttl: int = 3600):
+        self.client = client
+        self.key = key
+        self.ttl = ttl
+        self.fallback = None
+        self.logger = logging.getLogger(__name__)
+        self.client.delete(key)
+
+    def add_new(self, urls: List[str]) -> List[str]:
+        if self.fallback is not None:
+            return self.fallback.add_new(urls)
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return []
+        pipe = self.client.pipeline()
+        for url in urls:
+            pipe.sadd(self.key, url)
+        pipe.expire(self.key, self.ttl)
+        try:
+            added = pipe.execute()[:-1]
+        except redis.RedisError as e:
+            self.logger.warning(f"Redis dedup failed, using a local visited set: {str(e)}")
+            self.fallback = VisitedSet()
+            return self.fallback.add_new(urls)
+        return [url for url, was_added in zip(urls, added) if was_added == 1]
+
+def _create_chrome_driver(remote_url: Optional[str] = None) -> webdriver.Remote:
+    """
+    Start a headless Chrome WebDriver.
+    
+    Args:
+        remote_url (str): URL of a Selenium Grid or standalone server to open the
+            session on; a local chromedriver and browser are started when None
+            
+    Returns:
+        webdriver.Remote: The driver
+    """
+    chrome_options = Options()
+    chrome_options.add_argument('--headless')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    
+    if remote_url:
+        # The server keeps chromedriver running, so only a browser session is created
+        return webdriver.Remote(command_executor=remote_url, options=chrome_options, keep_alive=True)
+    if platform.system() == 'Darwin' and platform.machine() == 'arm64':
+        # For Mac ARM64, we need to use a specific ChromeDriver
+        return webdriver.Chrome(options=chrome_options)
+    service = Service(ChromeDriverManager().install())
+    return webdriver.Chrome(service=service, options=chrome_options)
+
+# WebDriver owned by this process when it is a render pool worker
+_worker_driver = None
+
+def _init_worker_driver(remote_url: Optional[str] = None):
+    """Start the WebDriver of a render pool worker and quit it when the worker exits."""
+    global _worker_driver
+    _worker_driver = _create_chrome_driver(remote_url)
+    multiprocessing.util.Finalize(None, _worker_driver.quit, exitpriority=10)
+
+def _render_with_selenium(url: str, wait_time: int = 0) -> str:
+    """
+    Load a page in this render pool worker's browser.
+    
+    Args:
+        url (str): The URL to render
+        wait_time (int): Time to wait after page load (for dynamic content)
+        
+    Returns:
+        str: The rendered page source
+        
+    Raises:
+        ScrapingError: If the browser fails to load the page
+    """
+    try:
+        _worker_driver.get(url)
+        if wait_time > 0:
+            time.sleep(wait_time)
+        return _worker_driver.page_source
+    except WebDriverException as e:
+        # Selenium's exceptions lose their message when pickled back to the parent
+        raise ScrapingError(f"Selenium error: {str(e)}")
+
+class ProcessPool(Executor):
+    """
+    A pool of worker processes that survives the death of a worker.
+    
+    A worker that dies, e.g. when it is OOM-killed or crashes in a native
+    extension, breaks a ProcessPoolExecutor for good, so the broken pool is
+    replaced by a new one the next time work is submitted. Work that was in
+    flight on the broken pool still fails with BrokenProcessPool.
+    """
+
+    def __init__(self, workers: int, initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        """
+        Args:
+            workers (int): Number of worker processes
+            initializer (callable): Called in each worker process when it starts
+            initargs (tuple): Arguments for initializer
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers
+        self._initializer = initializer
+        self._initargs = initargs
+        self._lock = threading.Lock()
+        self._executor = self._new_executor()
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=self._initializer,
+                                   initargs=self._initargs)
+
+    def _call(self, method: str, *args, **kwargs):
+        """Call a method of the current executor, replacing the executor first if it is broken."""
+        with self._lock:
+            try:
+                return getattr(self._executor, method)(*args, **kwargs)
+            except BrokenProcessPool:
+                self.logger.warning(f'{type(self).__name__} broken, starting new worker processes')
+                self._executor.shutdown(wait=False)
+                self._executor = self._new_executor()
+                return getattr(self._executor, method)(*args, **kwargs)
+
+    def submit(self, fn, /, *args, **kwargs) -> Future:
+        return self._call('submit', fn, *args, **kwargs)
+
+    def map(self, fn, *iterables, timeout=None, chunksize=1) -> Iterator:
+        return self._call('map', fn, *iterables, timeout=timeout, chunksize=chunksize)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+class RenderPool(ProcessPool):
+    """A pool of worker processes that each own a headless Chrome WebDriver."""
+
+    def __init__(self, workers: int, remote_url: Optional[str] = None):
+        """
+        Args:
+            workers (int): Number of worker processes, and so of browsers
+            remote_url (str): Selenium server to open the sessions on instead of local Chrome
+        """
+        super().__init__(workers, initializer=_init_worker_driver, initargs=(remote_url,))
+        self.remote_url = remote_url
+
+class DriverPool:
+    """
+    A thread-safe pool of reusable headless Chrome WebDrivers.
+    
+    Drivers are started on first demand up to size and handed out one per
+    scrape, so requests do not pay the browser startup cost each time. A driver
+    is quit and replaced after max_uses scrapes or once its session is broken.
+    """
+
+    def __init__(self, size: int = 4, max_uses: int = 50, timeout: Optional[float] = None,
+                 remote_url: Optional[str] = None):
+        """
+        Args:
+            size (int): Maximum number of drivers alive at once
+            max_uses (int): Number of scrapes after which a driver is recycled
+            timeout (float): Seconds to wait for a free driver (None waits forever)
+            remote_url (str): Selenium server to open sessions on instead of local Chrome
+        """
+        self.size = size
+        self.remote_url = remote_url
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self._idle = queue.Queue()
+        self._uses = {}
+        self._created = 0
+        self._lock = threading.Lock()
+        self.logger = logging.getLogger(__name__)
+
+    def acquire(self) -> webdriver.Chrome:
+        """
+        Borrow a driver, starting a new one if none is idle and the pool is not full.
+        
+        Returns:
+            WebDriver: A driver that must be handed back with release()
+            
+        Raises:
+            SeleniumError: If a driver cannot be started or none frees up in time
+        """
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                can_start = self._created < self.size
+                if can_start:
+                    self._created += 1
+            if can_start:
+                return self._start_driver()
+
+            if deadline is not None and time.monotonic() >= deadline:
+                raise SeleniumError('Timed out waiting for a free WebDriver')
+            # Poll so a slot freed by a retired driver is noticed as well
+            try:
+                return self._idle.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+    def release(self, driver: webdriver.Chrome):
+        """Reset a borrowed driver and return it to the pool, or retire it if worn out or broken."""
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+        if uses < self.max_uses and driver.session_id is not None:
+            try:
+                driver.delete_all_cookies()
+                try:
+                    driver.execute_script('window.localStorage.clear()')
+                except JavascriptException:
+                    # Pages such as about:blank have no localStorage
+                    pass
+                self._idle.put(driver)
+                return
+            except WebDriverException as e:
+                self.logger.debug(f'Discarding broken WebDriver: {str(e)}')
+        self._retire(driver)
+
+    def close(self):
+        """Quit all idle drivers."""
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._retire(driver)
+
+    def _start_driver(self) -> webdriver.Chrome:
+        try:
+            driver = _create_chrome_driver(self.remote_url)
+        except Exception as e:
+            with self._lock:
+                self._created -= 1
+            error_msg = f"Failed to setup Selenium: {str(e)}"
+            self.logger.error(error_msg)
+            self.logger.debug('Exception details', exc_info=True)
+            raise SeleniumError(error_msg)
+        self._uses[id(driver)] = 0
+        self.logger.debug('Started pooled WebDriver')
+        return driver
+
+    def _retire(self, driver: webdriver.Chrome):
+        self._uses.pop(id(driver), None)
+        with self._lock:
+            self._created -= 1
+        try:
+            driver.quit()
+        except Exception as e:
+            self.logger.error(f"Error quitting WebDriver: {str(e)}")
+
+class PlaywrightBrowser:
+    """
+    A headless Chromium driven by Playwright's async API, shared by scrapers.
+    
+    Playwright runs on the shared background event loop (see run_async), so
+    the synchronous scraper methods can call it from any thread. Each scraper
+    loads its pages in a context of its own (see new_context), so one job's
+    cookies and storage are not seen by another.
+    """
+
+    def __init__(self):
+        """
+        Raises:
+            SeleniumError: If Playwright is not installed or the browser fails to start
+        """
+        if async_playwright is None:
+            raise SeleniumError('Playwright is not installed')
+        self.logger = logging.getLogger(__name__)
+        try:
+            run_async(self._start())
+        except Exception as e:
+            raise SeleniumError(f"Failed to setup Playwright: {str(e)}")
+
+    async def _start(self):
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+
+    async def _new_context(self):
+        return await self._browser.new_context()
+
+    def new_context(self) -> 'PlaywrightContext':
+        """
+        Open a new browser context, with empty cookies and storage.
+        
+        Returns:
+            PlaywrightContext: The context, to be closed when its scrape is done
+        """
+        return PlaywrightContext(run_async(self._new_context()))
+
+    async def _close(self):
+        await self._browser.close()
+        await self._playwright.stop()
+
+    def close(self):
+        """Close the browser and stop Playwright."""
+        run_async(self._close())
+
+class PlaywrightContext:
+    """
+    A context of a PlaywrightBrowser in which one scraper loads its pages.
+    
+    Pages of a batch can be loaded concurrently in tabs of the context.
+    """
+
+    def __init__(self, context):
+        self.context = context
+
+    async def _render(self, url: str, wait_time: int) -> str:
+        page = await self.context.new_page()
+        try:
+            await page.goto(url, wait_until='networkidle')
+            if wait_time > 0:
+                await page.wait_for_timeout(wait_time * 1000)
+            return await page.content()
+        except PlaywrightError as e:
+            raise ScrapingError(f"Playwright error: {str(e)}")
+        finally:
+            await page.close()
+
+    def render(self, url: str, wait_time: int = 0) -> str:
+        """
+        Load a page in the browser.
+        
+        Args:
+            url (str): The URL to render
+            wait_time (int): Time to wait after page load (for dynamic content)
+            
+        Returns:
+            str: The rendered page source
+            
+        Raises:
+            ScrapingError: If the browser fails to load the page
+        """
+        return run_async(self._render(url, wait_time))
+
+    def submit(self, url: str, wait_time: int = 0) -> Future:
+        """Start loading a page in a new tab and return a future of its source, as render() does."""
+        return asyncio.run_coroutine_threadsafe(self._render(url, wait_time), _background_loop())
+
+    async def _form_login(self, url: str, credentials: Dict[str, str]) -> str:
+        page = await self.context.new_page()
+        try:
+            await page.goto(url)
+            await page.fill(f"[name=\"{credentials.get('username_field', 'username')}\"]", credentials['username'])
+            await page.fill(f"[name=\"{credentials.get('password_field', 'password')}\"]", credentials['password'])
+            await page.click(credentials.get('submit_selector', 'button[type="submit"]'))
+            await page.wait_for_load_state('networkidle')
+            return page.url
+        finally:
+            await page.close()
+
+    def form_login(self, url: str, credentials: Dict[str, str]) -> str:
+        """
+        Fill in and submit a login form; the session cookies stay in the browser context.
+        
+        Args:
+            url (str): The login URL
+            credentials (dict): The credentials, plus optional field names as for
+                WebScraper.authenticate
+            
+        Returns:
+            str: The URL the browser ended up on after submitting
+        """
+        return run_async(self._form_login(url, credentials))
+
+    async def _close(self):
+        await self.context.close()
+
+    def close(self):
+        """Close the context and its pages; the browser stays open."""
+        run_async(self._close())
+
 class WebScraper:
-    def __init__(self, use_selenium: bool = False, debug: bool = False):
+    def __init__(self, use_selenium: bool = False, debug: bool = False, concurrency: int = 20,
+                 driver: Optional[webdriver.Chrome] = None, http_cache: Optional[HTTPCache] = None,
+                 remote_url: Optional[str] = None, parse_pool: Optional[Executor] = None,
+                 rate_limit: Optional[float] = None, parallel: int = 1,
+                 render_pool: Optional[Executor] = None, engine: str = 'selenium',
+                 browser: Optional[PlaywrightBrowser] = None):
         """
         Initialize the WebScraper with optional Selenium support.
         
         Args:
             use_selenium (bool): Whether to use Selenium for JavaScript-heavy sites
             debug (bool): Enable debug mode for detailed logging
+            concurrency (int): Maximum number of in-flight requests for batch fetches
+            driver (WebDriver): An existing WebDriver to use instead of starting one,
+                e.g. from a DriverPool; it is not quit on close()
+            http_cache (HTTPCache): Cache used to revalidate pages with conditional GETs
+            remote_url (str): Selenium server to start the driver on instead of local Chrome
+            parse_pool (Executor): Process pool that parses batch-fetched pages; they are
+                parsed on threads in this process when None
+            rate_limit (float): Maximum requests per second to any one host while
+                crawling or fetching batches (None for no limit)
+            parallel (int): Number of pages Selenium crawls render at once; above 1 a
+                render pool of that many browsers is started unless one is given, or
+                with the Playwright engine that many tabs are opened at once
+            render_pool (Executor): A RenderPool that renders Selenium
+                pages in worker processes instead of self.driver; it is not shut down on close()
+            engine (str): Browser automation used when use_selenium is set: 'selenium',
+                or 'playwright' to render with a PlaywrightBrowser instead of WebDriver
+            browser (PlaywrightBrowser): Shared browser to open this scraper's Playwright
+                context in instead of starting one; it is not closed on close()
             
         Raises:
-            SeleniumError: If Selenium setup fails
+            SeleniumError: If browser setup fails
+            ValueError: If engine is unknown
         """
         self.session = requests.Session()
-        self.ua = UserAgent()
+        self.session.mount('https://', _HTTP_ADAPTER)
+        self.session.mount('http://', _HTTP_ADAPTER)
+        # Each scraper cycles through the shared pool from a random starting point
+        user_agents = _user_agent_pool()
+        start = random.randrange(len(user_agents))
+        self._user_agents = itertools.cycle(user_agents[start:] + user_agents[:start])
+        # Default headers are set once so every request reuses them
+        self.session.headers['User-Agent'] = next(self._user_agents)
         self.use_selenium = use_selenium
-        self.driver = None
+        self.driver = driver
+        self._owns_driver = driver is None
         self.debug = debug
+        self.concurrency = concurrency
+        self.http_cache = http_cache
+        self.remote_url = remote_url
+        self.parse_pool = parse_pool
+        self.rate_limit = rate_limit
+        # Per-host time of the last request, and of the next free async request slot
+        self._host_last = {}
+        self._host_next = {}
         
         # Configure logging
         self.logger = logging.getLogger(__name__)
         if debug:
             self.logger.setLevel(logging.DEBUG)
         
-        if use_selenium:
+        if engine not in ('selenium', 'playwright'):
+            raise ValueError(f"Unknown browser engine: {engine}")
+        self.engine = engine
+        self.browser = None
+        self._owned_browser = None
+        if use_selenium and engine == 'playwright':
+            if browser is None:
+                browser = self._owned_browser = PlaywrightBrowser()
+                self.logger.debug('Playwright browser started')
+            self.browser = browser.new_context()
+
+        self.parallel = parallel
+        self.render_pool = render_pool
+        self._owns_render_pool = False
+        if use_selenium and self.browser is None and render_pool is None and parallel > 1:
+            self.render_pool = RenderPool(parallel, remote_url)
+            self._owns_render_pool = True
+
+        if use_selenium and self.browser is None and self.driver is None and self.render_pool is None:
             self._setup_selenium()
 
+    def _throttle(self, host: str):
+        """Sleep just long enough to keep requests to host within the rate limit."""
+        if not self.rate_limit:
+            return
+        now = time.monotonic()
+        wait = self._host_last.get(host, 0) + 1 / self.rate_limit - now
+        if wait > 0:
+            time.sleep(wait)
+            now += wait
+        self._host_last[host] = now
+
+    async def _athrottle(self, host: str):
+        """Wait for the next free request slot for host under the rate limit."""
+        if not self.rate_limit:
+            return
+        now = time.monotonic()
+        slot = max(now, self._host_next.get(host, now))
+        # Reserve the slot before waiting so concurrent fetches queue up behind it
+        self._host_next[host] = slot + 1 / self.rate_limit
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def _rotate_user_agent(self):
+        """Switch the session to the next User-Agent in the rotation."""
+        self.session.headers['User-Agent'] = next(self._user_agents)
+        self.logger.debug(f"Rotated User-Agent to {self.session.headers['User-Agent']}")
+
     def _setup_selenium(self):
         """
         Set up Selenium WebDriver with appropriate options
@@ -72,24 +1154,12 @@ class WebScraper:
             SeleniumError: If WebDriver setup fails
         """
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            
-            if platform.system() == 'Darwin' and platform.machine() == 'arm64':
-                # For Mac ARM64, we need to use a specific ChromeDriver
-                service = Service()
-                self.driver = webdriver.Chrome(options=chrome_options)
-            else:
-                service = Service(ChromeDriverManager().install())
-                self.driver = webdriver.Chrome(service=service, options=chrome_options)
-            
+            self.driver = _create_chrome_driver(self.remote_url)
             self.logger.debug("Selenium WebDriver setup successful")
         except Exception as e:
             error_msg = f"Failed to setup Selenium: {str(e)}"
             self.logger.error(error_msg)
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             raise SeleniumError(error_msg)
 
     def authenticate(self, url: str, auth_type: str, credentials: Dict[str, str]) -> bool:
@@ -109,13 +1179,15 @@ class WebScraper:
             
             if auth_type == 'basic':
                 self.session.auth = (credentials.get('username'), credentials.get('password'))
-                response = self.session.get(url)
+                response = self.session.get(url, timeout=REQUEST_TIMEOUT)
                 success = response.status_code == 200
                 self.logger.debug(f'Basic auth result: {success}')
                 return success
                 
             elif auth_type == 'form':
-                if self.use_selenium:
+                if self.browser is not None:
+                    return self._playwright_form_auth(url, credentials)
+                elif self.use_selenium:
                     return self._selenium_form_auth(url, credentials)
                 else:
                     return self._requests_form_auth(url, credentials)
@@ -129,7 +1201,7 @@ class WebScraper:
                 
         except Exception as e:
             self.logger.error(f"Authentication failed: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             return False
 
     def _selenium_form_auth(self, url: str, credentials: Dict[str, str]) -> bool:
@@ -138,11 +1210,11 @@ class WebScraper:
             self.logger.debug('Starting Selenium form authentication')
             self.driver.get(url)
             
-            # Wait for page load
-            time.sleep(2)
+            # Wait only until the login form is on the page
+            username_field = WebDriverWait(self.driver, AUTH_WAIT_TIMEOUT, poll_frequency=0.1).until(
+                EC.presence_of_element_located(('name', credentials.get('username_field', 'username'))))
             
-            # Find and fill username field
-            username_field = self.driver.find_element('name', credentials.get('username_field', 'username'))
+            # Fill username field
             username_field.send_keys(credentials['username'])
             self.logger.debug('Username field filled')
             
@@ -156,8 +1228,14 @@ class WebScraper:
             submit_button.click()
             self.logger.debug('Submit button clicked')
             
-            # Wait for login to complete
-            time.sleep(2)
+            # Wait for login to complete: the form page is replaced, or the URL
+            # leaves the login page
+            try:
+                WebDriverWait(self.driver, AUTH_WAIT_TIMEOUT, poll_frequency=0.1).until(EC.any_of(
+                    EC.staleness_of(submit_button),
+                    lambda driver: 'login' not in driver.current_url.lower()))
+            except TimeoutException:
+                self.logger.debug('Login did not complete in time')
             
             # Check if login was successful
             success = 'login' not in self.driver.current_url.lower()
@@ -166,7 +1244,21 @@ class WebScraper:
             
         except Exception as e:
             self.logger.error(f"Selenium authentication failed: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
+            return False
+
+    def _playwright_form_auth(self, url: str, credentials: Dict[str, str]) -> bool:
+        """Handle form-based authentication using Playwright."""
+        try:
+            self.logger.debug('Starting Playwright form authentication')
+            final_url = self.browser.form_login(url, credentials)
+            success = 'login' not in final_url.lower()
+            self.logger.debug(f'Playwright form auth result: {success}')
+            return success
+            
+        except Exception as e:
+            self.logger.error(f"Playwright authentication failed: {str(e)}")
+            self.logger.debug('Exception details', exc_info=True)
             return False
 
     def _requests_form_auth(self, url: str, credentials: Dict[str, str]) -> bool:
@@ -174,8 +1266,8 @@ class WebScraper:
         try:
             self.logger.debug('Starting requests form authentication')
             # First get the login page to obtain any necessary tokens
-            response = self.session.get(url)
-            soup = BeautifulSoup(response.text, 'lxml')
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+            soup = _make_soup(response.content)
             
             # Prepare login data
             login_data = {
@@ -189,29 +1281,24 @@ class WebScraper:
             
             self.logger.debug('Submitting login form')
             # Submit the login form
-            response = self.session.post(url, data=login_data)
+            response = self.session.post(url, data=login_data, timeout=REQUEST_TIMEOUT)
             success = response.status_code == 200
             self.logger.debug(f'Requests form auth result: {success}')
             return success
             
         except Exception as e:
             self.logger.error(f"Requests authentication failed: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             return False
 
     def _api_auth(self, url: str, credentials: Dict[str, str]) -> bool:
         """Handle API-based authentication."""
         try:
             self.logger.debug('Starting API authentication')
-            headers = {
-                'Content-Type': 'application/json',
-                'User-Agent': self.ua.random
-            }
-            
             response = self.session.post(
                 url,
                 json=credentials,
-                headers=headers
+                timeout=REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
@@ -227,10 +1314,11 @@ class WebScraper:
             
         except Exception as e:
             self.logger.error(f"API authentication failed: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             return False
 
-    def scrape(self, url: str, parser: str = 'html.parser', wait_time: int = 0) -> BeautifulSoup:
+    def scrape(self, url: str, parser: str = 'lxml', wait_time: int = 0,
+               parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
         """
         Scrape content from a URL.
         
@@ -238,6 +1326,7 @@ class WebScraper:
             url (str): The URL to scrape
             parser (str): The parser to use for BeautifulSoup
             wait_time (int): Time to wait after page load (for dynamic content)
+            parse_only (SoupStrainer): If given, only the matching tags are parsed
             
         Returns:
             BeautifulSoup object
@@ -252,7 +1341,11 @@ class WebScraper:
             if not url:
                 raise ValueError("URL cannot be empty")
             
-            if self.use_selenium:
+            if self.browser is not None:
+                html = self.browser.render(url, wait_time)
+            elif self.use_selenium and self.render_pool is not None:
+                html = self.render_pool.submit(_render_with_selenium, url, wait_time).result()
+            elif self.use_selenium:
                 try:
                     self.driver.get(url)
                     if wait_time > 0:
@@ -263,10 +1356,21 @@ class WebScraper:
                     raise ScrapingError(f"Selenium error: {str(e)}")
             else:
                 try:
-                    headers = {'User-Agent': self.ua.random}
-                    response = self.session.get(url, headers=headers, timeout=30)
-                    response.raise_for_status()
-                    html = response.text
+                    cached = self.http_cache.get(url) if self.http_cache else None
+                    headers = cached[0] if cached else None
+                    response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                    if response.status_code == 403:
+                        # The site may be blocking this User-Agent; retry once with another
+                        self._rotate_user_agent()
+                        response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+                    if cached and response.status_code == 304:
+                        self.logger.debug(f'Not modified, using cached copy of {url}')
+                        html = _cached_page(cached[1])
+                    else:
+                        response.raise_for_status()
+                        html = _decode_body(response.content, _header_charset(response.headers.get('Content-Type')))
+                        if self.http_cache:
+                            self.http_cache.set(url, response.headers, _cache_body(html))
                 except requests.exceptions.Timeout:
                     raise ScrapingError(f"Request timed out after 30 seconds")
                 except requests.exceptions.ConnectionError as e:
@@ -275,20 +1379,130 @@ class WebScraper:
                     raise ScrapingError(f"HTTP error: {str(e)}")
             
             self.logger.debug('Page content retrieved successfully')
-            return BeautifulSoup(html, parser)
+            return _make_soup(html, parser, parse_only)
             
         except Exception as e:
             if not isinstance(e, ScrapingError):
                 raise ScrapingError(f"Scraping failed for {url}: {str(e)}")
             raise
 
-    def extract_data(self, soup: BeautifulSoup, selectors: Dict[str, str]) -> Dict[str, Any]:
+    async def async_fetch_all(self, urls: List[str], concurrency: Optional[int] = None) -> List[Union[str, bytes, Exception]]:
+        """
+        Fetch several URLs concurrently with aiohttp.
+        
+        Args:
+            urls (list): The URLs to fetch
+            concurrency (int): Maximum number of in-flight requests (defaults to self.concurrency)
+            
+        Returns:
+            list: The HTML of each URL in the same order as urls; a failed fetch
+            is returned as the exception it raised instead of HTML
+        """
+        concurrency = concurrency or self.concurrency
+        semaphore = asyncio.Semaphore(concurrency)
+        async with self._async_session(concurrency) as session:
+            return await asyncio.gather(*(self._afetch(session, semaphore, url) for url in urls),
+                                        return_exceptions=True)
+
+    def _async_session(self, concurrency: int) -> aiohttp.ClientSession:
+        """
+        Create an aiohttp session that carries over any authentication state
+        from the requests session.
+        
+        Args:
+            concurrency (int): Maximum number of open connections
+            
+        Returns:
+            aiohttp.ClientSession: The session, to be used as an async context manager
+        """
+        # Connections are per crawl, since aiohttp sessions belong to one event
+        # loop, but resolved hosts are shared by every crawl in the process
+        connector = aiohttp.TCPConnector(limit=concurrency, ttl_dns_cache=DNS_CACHE_TTL,
+                                         resolver=_SharedDNSResolver())
+        timeout = aiohttp.ClientTimeout(total=30)
+        headers = dict(self.session.headers)
+        cookies = self.session.cookies.get_dict()
+        return aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers=headers, cookies=cookies)
+
+    async def _afetch(self, session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, url: str) -> Union[str, bytes]:
         """
-        Extract data from BeautifulSoup object using HTML tags.
+        Fetch a single URL, revalidating it against the HTTP cache if there is one.
+        
+        Args:
+            session (aiohttp.ClientSession): The session to fetch with
+            semaphore (asyncio.Semaphore): Bounds the number of in-flight requests
+            url (str): The URL to fetch, once the host's rate limit allows
+            
+        Returns:
+            str: The HTML of the page, as bytes if its response declares no charset
+        """
+        await self._athrottle(urlparse(url).netloc)
+        async with semaphore:
+            self.logger.debug(f'Fetching {url}')
+            # SQLite and zlib work runs on the executor, not on the shared loop
+            loop = asyncio.get_running_loop()
+            cached = await loop.run_in_executor(None, self.http_cache.get, url) if self.http_cache else None
+            async with session.get(url, headers=cached[0] if cached else None) as response:
+                if cached and response.status == 304:
+                    return _cached_page(cached[1])
+                response.raise_for_status()
+                html = _decode_body(await response.read(), response.charset)
+                if self.http_cache:
+                    await loop.run_in_executor(None, self.http_cache.set, url, response.headers, _cache_body(html))
+                return html
+
+    def _fetch_and_extract(self, urls: List[str], selectors: Selectors) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Fetch pages concurrently and extract data from each of them.
+        
+        Args:
+            urls (list): The URLs to scrape
+            selectors (dict): Dictionary of data keys and their CSS selectors
+            
+        Returns:
+            list: Extracted data for each URL in the same order as urls; a page
+            that failed to fetch or extract is returned as the exception raised
+        """
+        pages = run_async(self.async_fetch_all(urls))
+
+        if self.parse_pool is not None:
+            # Parse in worker processes so pages are not serialized by the GIL
+            fetched = [i for i, html in enumerate(pages) if not isinstance(html, Exception)]
+            batch = [(pages[i], selectors) for i in fetched]
+            try:
+                results = list(self.parse_pool.map(_parse_worker, batch, chunksize=8))
+            except BrokenProcessPool:
+                # A dying worker takes the whole batch with it; parse it once
+                # more on the new processes the parse pool starts
+                self.logger.warning('Parse worker died, parsing the batch again')
+                results = list(self.parse_pool.map(_parse_worker, batch, chunksize=8))
+            for i, result in zip(fetched, results):
+                pages[i] = result
+            return pages
+
+        def parse(html):
+            if isinstance(html, Exception):
+                return html
+            try:
+                return _extract_page(html, selectors)
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor() as executor:
+            return list(executor.map(parse, pages))
+
+    def extract_data(self, soup: BeautifulSoup, selectors: Selectors) -> Dict[str, Any]:
+        """
+        Extract data from BeautifulSoup object using CSS selectors.
         
         Args:
             soup (BeautifulSoup): The BeautifulSoup object
-            selectors (dict): Dictionary of data keys and their HTML tags
+            selectors (dict): Dictionary of data keys and their CSS selectors
+                (plain HTML tags such as 'h1' are valid selectors), either as
+                strings or as returned by _compile_selectors. A key may instead
+                map to {'selector': ..., 'multi': False} to extract only the first
+                match; lone ID selectors such as '#title' do so by default
             
         Returns:
             dict: Extracted data
@@ -296,46 +1510,32 @@ class WebScraper:
         Raises:
             SelectorError: If selectors are invalid or no elements found
         """
-        if not selectors:
-            raise SelectorError("No selectors provided")
+        return _extract_data(soup, selectors)
+
+    def _compile_selectors(self, selectors: Selectors) -> Selectors:
+        """
+        Compile selectors once so a multi-page scrape does not re-parse them per page.
+        
+        Args:
+            selectors (dict): Dictionary of data keys and their CSS selectors or
+                selector specs; already compiled selectors are kept as they are
             
-        data = {}
-        for key, tag in selectors.items():
+        Returns:
+            dict: The data keys and their compiled selectors, or specs holding them
+            
+        Raises:
+            SelectorError: If a selector is not valid CSS
+        """
+        compiled = {}
+        for key, spec in selectors.items():
             try:
-                self.logger.debug(f'Extracting data for key: {key} with tag: {tag}')
-                # Find all elements with the given tag
-                elements = soup.find_all(tag)
-                
-                if elements:
-                    if len(elements) == 1:
-                        # For single elements, get text and href if it's a link
-                        element = elements[0]
-                        if element.name == 'a' and element.get('href'):
-                            data[key] = f"{element.get_text(strip=True)} ({element['href']})"
-                        elif element.name == 'img' and element.get('src'):
-                            data[key] = f"Image: {element['src']}"
-                        else:
-                            data[key] = element.get_text(strip=True)
-                    else:
-                        # For multiple elements, get text and href for each
-                        data[key] = []
-                        for element in elements:
-                            if element.name == 'a' and element.get('href'):
-                                data[key].append(f"{element.get_text(strip=True)} ({element['href']})")
-                            elif element.name == 'img' and element.get('src'):
-                                data[key].append(f"Image: {element['src']}")
-                            else:
-                                data[key].append(element.get_text(strip=True))
-                    self.logger.debug(f'Successfully extracted data for {key}')
-                else:
-                    self.logger.warning(f'No elements found for tag: {tag}')
-                    data[key] = None
+                selector = spec['selector'] if isinstance(spec, dict) else spec
+                if not isinstance(selector, soupsieve.SoupSieve):
+                    selector = _compile_selector(selector)
+                compiled[key] = {**spec, 'selector': selector} if isinstance(spec, dict) else selector
             except Exception as e:
-                error_msg = f"Failed to extract {key}: {str(e)}"
-                self.logger.error(error_msg)
-                self.logger.debug(traceback.format_exc())
-                raise SelectorError(error_msg)
-        return data
+                raise SelectorError(f"Invalid selector for {key}: {str(e)}")
+        return compiled
 
     def save_to_json(self, data: Dict[str, Any], filename: str) -> bool:
         """
@@ -353,26 +1553,34 @@ class WebScraper:
         """
         try:
             self.logger.debug(f'Saving data to {filename}')
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # orjson encodes straight to UTF-8 bytes, including datetime values
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
             self.logger.debug('Data saved successfully')
             return True
         except Exception as e:
             error_msg = f"Failed to save data: {str(e)}"
             self.logger.error(error_msg)
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             raise IOError(error_msg)
 
     def close(self):
         """Clean up resources"""
         try:
-            if self.driver:
+            if self.driver and self._owns_driver:
                 self.driver.quit()
-            self.session.close()
+            if self._owns_render_pool:
+                self.render_pool.shutdown()
+            if self.browser is not None:
+                self.browser.close()
+            if self._owned_browser is not None:
+                self._owned_browser.close()
+            # The session's adapter is shared, so the session is not closed and
+            # its pooled connections stay open for other scrapers
             self.logger.debug('Resources cleaned up successfully')
         except Exception as e:
             self.logger.error(f"Error during cleanup: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
 
     def parse_sitemap(self, sitemap_url: str) -> List[str]:
         """
@@ -384,34 +1592,152 @@ class WebScraper:
         Returns:
             List[str]: List of URLs from the sitemap
         """
+        return list(self.iter_sitemap(sitemap_url))
+
+    def iter_sitemap(self, sitemap_url: str) -> Iterator[str]:
+        """
+        Stream the page URLs of a sitemap as it is downloaded and parsed.
+        
+        Sitemap indexes are followed recursively, fetching their child sitemaps
+        concurrently, and gzipped sitemaps (.xml.gz) are decompressed on the fly. A sitemap that cannot be fetched or parsed
+        is logged and yields no further URLs.
+        
+        Args:
+            sitemap_url (str): URL of the sitemap
+            
+        Yields:
+            str: Each page URL in the sitemap
+        """
+        count = 0
         try:
             self.logger.debug(f'Parsing sitemap: {sitemap_url}')
-            response = self.session.get(sitemap_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'xml')
-            urls = []
-            
+            # The parsed <loc> list is cached, so an unchanged sitemap is not re-parsed
+            cache_key = f'sitemap:{sitemap_url}'
+            cached = self.http_cache.get(cache_key) if self.http_cache else None
+            with self.session.get(sitemap_url, headers=cached[0] if cached else None,
+                                  timeout=REQUEST_TIMEOUT, stream=True) as response:
+                if cached and response.status_code == 304:
+                    self.logger.debug(f'Sitemap not modified, using cached entries for {sitemap_url}')
+                    parsed = orjson.loads(cached[1])
+                    is_index, locs = parsed['index'], parsed['locs']
+                else:
+                    response.raise_for_status()
+                    response.raw.decode_content = True
+                    stream = response.raw
+                    if sitemap_url.endswith('.gz') and response.headers.get('Content-Encoding') != 'gzip':
+                        stream = gzip.GzipFile(fileobj=stream)
+                    is_index = None
+                    locs = []
+                    # Only finished <url>/<sitemap> entries are reported, so lxml skips
+                    # every other element without a round trip through Python
+                    for _, elem in etree.iterparse(stream, tag=('{*}url', '{*}sitemap'), resolve_entities=False):
+                        if is_index is None:
+                            is_index = etree.QName(elem).localname == 'sitemap'
+                        # The entry's own <loc>, not those of e.g. image extensions
+                        loc = elem.findtext('{*}loc')
+                        if loc and loc.strip():
+                            loc = loc.strip()
+                            # Page URLs are streamed, so they are only kept for the cache
+                            if is_index or self.http_cache:
+                                locs.append(loc)
+                            if not is_index:
+                                count += 1
+                                yield loc
+                        # Drop each finished entry to keep memory flat
+                        elem.clear()
+                        while elem.getprevious() is not None:
+                            del elem.getparent()[0]
+                    if self.http_cache:
+                        self.http_cache.set(cache_key, response.headers, orjson.dumps({'index': bool(is_index), 'locs': locs}))
+                    if not is_index:
+                        locs = []
+
             # Handle both sitemap index and regular sitemaps
-            if soup.find('sitemapindex'):
-                # This is a sitemap index
-                for sitemap in soup.find_all('loc'):
-                    sub_urls = self.parse_sitemap(sitemap.text)
-                    urls.extend(sub_urls)
+            if is_index and locs:
+                # Child sitemaps are fetched concurrently, up to concurrency of them
+                # ahead of the one being yielded, and their URLs yielded in index order
+                children = iter(locs)
+                executor = ThreadPoolExecutor(max_workers=min(len(locs), self.concurrency))
+                try:
+                    pending = deque(executor.submit(self.parse_sitemap, loc)
+                                    for loc in itertools.islice(children, self.concurrency))
+                    while pending:
+                        page_urls = pending.popleft().result()
+                        for loc in itertools.islice(children, 1):
+                            pending.append(executor.submit(self.parse_sitemap, loc))
+                        for page_url in page_urls:
+                            count += 1
+                            yield page_url
+                finally:
+                    executor.shutdown(cancel_futures=True)
             else:
                 # This is a regular sitemap
-                for url in soup.find_all('loc'):
-                    urls.append(url.text)
+                for loc in locs:
+                    count += 1
+                    yield loc
             
-            self.logger.debug(f'Found {len(urls)} URLs in sitemap')
-            return urls
+            self.logger.debug(f'Found {count} URLs in sitemap')
             
         except Exception as e:
             self.logger.error(f"Failed to parse sitemap: {str(e)}")
-            self.logger.debug(traceback.format_exc())
-            return []
+            self.logger.debug('Exception details', exc_info=True)
 
-    def crawl_website(self, start_url: str, max_pages: int = 100, same_domain_only: bool = True) -> Dict[str, Any]:
+    def _render_pages(self, urls: List[str], wait_time: int = 0,
+                      parse_only: Optional[SoupStrainer] = None) -> List[Union[BeautifulSoup, Exception]]:
+        """
+        Scrape several pages with Selenium, rendering them in parallel when there
+        is a render pool or a Playwright browser.
+        
+        Args:
+            urls (list): The URLs to scrape
+            wait_time (int): Time to wait after each page load
+            parse_only (SoupStrainer): If given, only the matching tags are parsed
+            
+        Returns:
+            list: The parsed page for each URL in the same order as urls; a page
+            that failed is returned as the exception raised instead
+        """
+        results = []
+        if self.browser is None and self.render_pool is None:
+            for url in urls:
+                try:
+                    self._throttle(urlparse(url).netloc)
+                    results.append(self.scrape(url, wait_time=wait_time, parse_only=parse_only))
+                except Exception as e:
+                    results.append(e)
+            return results
+
+        futures = []
+        for url in urls:
+            self._throttle(urlparse(url).netloc)
+            if self.browser is not None:
+                futures.append(self.browser.submit(url, wait_time))
+            else:
+                futures.append(self.render_pool.submit(_render_with_selenium, url, wait_time))
+
+        def collect(futures):
+            pages = []
+            for future in futures:
+                try:
+                    pages.append(_make_soup(future.result(), parse_only=parse_only))
+                except Exception as e:
+                    pages.append(e)
+            return pages
+
+        results = collect(futures)
+        # A dying worker takes every render in flight with it; those are tried
+        # once more on the new processes the render pool starts
+        broken = [i for i, result in enumerate(results) if isinstance(result, BrokenProcessPool)]
+        if broken and self.browser is None:
+            self.logger.warning(f'Retrying {len(broken)} pages after a render worker died')
+            retries = collect([self.render_pool.submit(_render_with_selenium, urls[i], wait_time) for i in broken])
+            for i, result in zip(broken, retries):
+                results[i] = result
+        return results
+
+    def crawl_website(self, start_url: str, max_pages: int = 100, same_domain_only: bool = True,
+                      on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
+                      visited: Optional[VisitedSet] = None) -> Dict[str, Any]:
         """
         Crawl a website starting from a URL and discover internal links.
         
@@ -419,96 +1745,85 @@ class WebScraper:
             start_url (str): The starting URL to crawl
             max_pages (int): Maximum number of pages to crawl
             same_domain_only (bool): Whether to only crawl pages from the same domain
+            on_item (callable): If given, called with each page's data (including its
+                'url') as soon as it is crawled, instead of collecting it in 'pages'
+            visited (VisitedSet): Where to record queued URLs (defaults to an in-memory Bloom filter)
             
         Returns:
             Dict[str, Any]: Dictionary containing crawled pages and their data
         """
         try:
             self.logger.debug(f'Starting website crawl from: {start_url}')
+
+            if not self.use_selenium:
+                # Plain HTTP pages are fetched concurrently
+                return self._run_acrawl(start_url, None, max_pages, same_domain_only, on_item, visited)
             
             # Parse the start URL to get the base domain
             parsed_start_url = urlparse(start_url)
             base_domain = parsed_start_url.netloc
             
-            # Initialize sets to track visited and discovered URLs
-            visited_urls = set()
-            discovered_urls = set([start_url])
+            # A FIFO frontier, so pages are crawled breadth first. Links are deduplicated
+            # on their canonical form before being queued, so each URL is queued once.
+            pages_crawled = 0
+            frontier = deque([start_url])
+            if visited is None:
+                visited = BloomVisitedSet()
+            visited.add_new([canonicalize_url(start_url)])
             crawl_data = {}
             
             # Set a timeout for the entire crawling process
             start_time = time.time()
             max_crawl_time = 240  # 4 minutes maximum crawl time
             
-            while discovered_urls and len(visited_urls) < max_pages:
+            while frontier and pages_crawled < max_pages:
                 # Check if we've exceeded the maximum crawl time
                 if time.time() - start_time > max_crawl_time:
                     self.logger.warning(f"Crawl time exceeded {max_crawl_time} seconds")
                     break
                 
-                # Get the next URL to crawl
-                current_url = discovered_urls.pop()
+                # Get the next URLs to crawl, as many as can be rendered at once
+                batch_size = min(self.parallel, max_pages - pages_crawled, len(frontier))
+                batch = [frontier.popleft() for _ in range(batch_size)]
                 
-                if current_url in visited_urls:
-                    continue
-                
-                try:
-                    self.logger.debug(f'Crawling: {current_url}')
-                    
-                    # Scrape the current page with a timeout
+                for current_url, soup in zip(batch, self._render_pages(batch, parse_only=_LINK_STRAINER)):
                     try:
-                        soup = self.scrape(current_url)
-                    except Exception as e:
-                        self.logger.error(f"Failed to scrape {current_url}: {str(e)}")
-                        continue
-                    
-                    # Extract all links from the page
-                    links = soup.find_all('a', href=True)
-                    page_links = []
-                    
-                    # Process each link
-                    for link in links:
-                        href = link.get('href')
-                        if not href:
+                        self.logger.debug(f'Crawling: {current_url}')
+                        if isinstance(soup, Exception):
+                            self.logger.error(f"Failed to scrape {current_url}: {str(soup)}")
                             continue
-                            
-                        # Convert relative URLs to absolute
-                        absolute_url = urljoin(current_url, href)
-                        parsed_url = urlparse(absolute_url)
                         
-                        # Skip if not same domain and same_domain_only is True
-                        if same_domain_only and parsed_url.netloc != base_domain:
-                            continue
-                            
-                        # Skip if not http/https
-                        if parsed_url.scheme not in ['http', 'https']:
-                            continue
-                            
-                        # Add to discovered URLs if not visited
-                        if absolute_url not in visited_urls:
-                            discovered_urls.add(absolute_url)
-                            page_links.append(absolute_url)
-                    
-                    # Store the page data
-                    crawl_data[current_url] = {
-                        'title': soup.title.string if soup.title else None,
-                        'links': page_links,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    # Mark as visited
-                    visited_urls.add(current_url)
-                    
-                    # Add a small delay between requests
-                    time.sleep(1)
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to crawl {current_url}: {str(e)}")
-                    continue
+                        # Extract all links from the page
+                        page_links = _page_links(soup, current_url, base_domain, same_domain_only)
+                        candidates = {}
+                        for absolute_url in page_links:
+                            candidates.setdefault(canonicalize_url(absolute_url), absolute_url)
+
+                        # Queue only links that have not been seen before
+                        for canonical_url in visited.add_new(list(candidates)):
+                            frontier.append(candidates[canonical_url])
+                        
+                        # Store the page data
+                        page_data = {
+                            'title': soup.title.string if soup.title else None,
+                            'links': page_links,
+                            'timestamp': datetime.now()
+                        }
+                        if on_item:
+                            on_item({'url': current_url, **page_data})
+                        else:
+                            crawl_data[current_url] = page_data
+                        
+                        pages_crawled += 1
+                        
+                    except Exception as e:
+                        self.logger.error(f"Failed to crawl {current_url}: {str(e)}")
+                        continue
             
-            self.logger.debug(f'Crawl completed. Visited {len(visited_urls)} pages')
+            self.logger.debug(f'Crawl completed. Visited {pages_crawled} pages')
             return {
                 'base_url': start_url,
-                'total_pages': len(visited_urls),
+                'total_pages': pages_crawled,
                 'max_pages': max_pages,
                 'pages': crawl_data,
                 'crawl_time': time.time() - start_time
@@ -516,12 +1831,139 @@ class WebScraper:
             
         except Exception as e:
             self.logger.error(f"Website crawling failed: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             return {}
 
+    async def acrawl(self, start_url: str, selectors: Optional[Selectors] = None,
+                     max_pages: int = 100, same_domain_only: bool = True,
+                     on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
+                     visited: Optional[VisitedSet] = None,
+                     stop_event: Optional[threading.Event] = None) -> int:
+        """
+        Crawl a website with concurrent fetches, handing each page to on_item as
+        soon as it is done. At most self.concurrency requests are in flight.
+        
+        Args:
+            start_url (str): The starting URL to crawl
+            selectors (dict): If given, the data extracted with these CSS selectors is
+                reported for each page instead of its title and links
+            max_pages (int): Maximum number of pages to crawl
+            same_domain_only (bool): Whether to only crawl pages from the same domain
+            on_item (callable): Called with each page's data, including its 'url'
+            visited (VisitedSet): Where to record queued URLs (defaults to an in-memory Bloom filter)
+            stop_event (threading.Event): If set, the crawl stops early
+            
+        Returns:
+            int: Number of pages crawled
+        """
+        base_domain = urlparse(start_url).netloc
+        if selectors:
+            selectors = self._compile_selectors(selectors)
+        if visited is None:
+            visited = BloomVisitedSet()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        loop = asyncio.get_running_loop()
+
+        async def add_new(urls):
+            # A shared set's round trip runs on a thread, not on the shared loop
+            if visited.blocking:
+                return await loop.run_in_executor(None, visited.add_new, urls)
+            return visited.add_new(urls)
+
+        await add_new([canonicalize_url(start_url)])
+        start_time = time.time()
+        max_crawl_time = 240  # 4 minutes maximum crawl time
+
+        async with self._async_session(self.concurrency) as session:
+            async def crawl_page(url):
+                html = await self._afetch(session, semaphore, url)
+                # Parse off the event loop so other fetches keep flowing
+                args = (_parse_crawl_page, url, html, selectors, base_domain, same_domain_only)
+                try:
+                    return await loop.run_in_executor(self.parse_pool, *args)
+                except BrokenProcessPool:
+                    # A dying worker fails every page in flight; each gets one
+                    # more try on the new processes the parse pool starts
+                    return await loop.run_in_executor(self.parse_pool, *args)
+
+            backlog = deque([start_url])
+            pending = {}
+            crawled = 0
+            try:
+                while backlog or pending:
+                    if stop_event and stop_event.is_set():
+                        self.logger.debug('Crawl stopped')
+                        break
+                    if time.time() - start_time > max_crawl_time:
+                        self.logger.warning(f"Crawl time exceeded {max_crawl_time} seconds")
+                        break
+                    # Failed pages give their slot back, so keep topping up from the backlog
+                    while backlog and crawled + len(pending) < max_pages:
+                        url = backlog.popleft()
+                        pending[asyncio.ensure_future(crawl_page(url))] = url
+                    if not pending:
+                        break
+
+                    done, _ = await asyncio.wait(pending, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        url = pending.pop(task)
+                        try:
+                            item, links = task.result()
+                        except Exception as e:
+                            self.logger.error(f"Failed to crawl {url}: {str(e)}")
+                            continue
+                        crawled += 1
+                        candidates = {}
+                        for absolute_url in links:
+                            candidates.setdefault(canonicalize_url(absolute_url), absolute_url)
+                        for canonical_url in await add_new(list(candidates)):
+                            backlog.append(candidates[canonical_url])
+                        if on_item:
+                            on_item(item)
+            finally:
+                # Also on errors from on_item or visited, so no fetch or parse is
+                # left running on the shared loop against the closing session
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        self.logger.debug(f'Crawl completed. Visited {crawled} pages')
+        return crawled
+
+    def _run_acrawl(self, start_url: str, selectors: Optional[Selectors], max_pages: int,
+                    same_domain_only: bool, on_item: Optional[Callable[[Dict[str, Any]], None]],
+                    visited: Optional[VisitedSet]) -> Dict[str, Any]:
+        """
+        Run acrawl to completion and summarize it like crawl_website does.
+        
+        Returns:
+            Dict[str, Any]: The crawl summary; pages are keyed by URL under 'pages'
+            unless on_item was given
+        """
+        pages = {}
+
+        def collect(item):
+            if on_item:
+                on_item(item)
+            else:
+                pages[item.pop('url')] = item
+
+        start_time = time.time()
+        total_pages = run_async(self.acrawl(start_url, selectors, max_pages, same_domain_only,
+                                            on_item=collect, visited=visited))
+        return {
+            'base_url': start_url,
+            'total_pages': total_pages,
+            'max_pages': max_pages,
+            'pages': pages,
+            'crawl_time': time.time() - start_time
+        }
+
     def crawl_and_scrape(self, start_url: str, selectors: Dict[str, str], 
                         max_pages: int = 100, same_domain_only: bool = True,
-                        wait_time: int = 0) -> Dict[str, Any]:
+                        wait_time: int = 0,
+                        on_item: Optional[Callable[[Dict[str, Any]], None]] = None,
+                        visited: Optional[VisitedSet] = None) -> Dict[str, Any]:
         """
         Crawl a website and scrape data from each page using provided selectors.
         
@@ -531,15 +1973,33 @@ class WebScraper:
             max_pages (int): Maximum number of pages to crawl
             same_domain_only (bool): Whether to only crawl pages from the same domain
             wait_time (int): Time to wait after page load
+            on_item (callable): If given, called with each page's scraped data (including
+                its 'url') as soon as it is extracted, instead of collecting it in 'scraped_data'
+            visited (VisitedSet): Where to record queued URLs (defaults to an in-memory Bloom filter)
             
         Returns:
             Dict[str, Any]: Combined data from all crawled pages
         """
         try:
             self.logger.debug(f'Starting crawl and scrape from: {start_url}')
+            selectors = self._compile_selectors(selectors)
             
+            if not self.use_selenium:
+                # Plain HTTP pages are crawled and scraped concurrently in one pass
+                crawl_result = self._run_acrawl(start_url, selectors, max_pages, same_domain_only,
+                                                on_item, visited)
+                if not crawl_result['total_pages']:
+                    self.logger.error('No pages found to scrape')
+                    return {}
+                scraped_data = crawl_result.pop('pages')
+                self.logger.debug(f'Crawl and scrape completed. Scraped {crawl_result["total_pages"]} pages')
+                return {
+                    'crawl_info': crawl_result,
+                    'scraped_data': scraped_data
+                }
+
             # First crawl the website to discover URLs
-            crawl_result = self.crawl_website(start_url, max_pages, same_domain_only)
+            crawl_result = self.crawl_website(start_url, max_pages, same_domain_only, visited=visited)
             
             if not crawl_result or not crawl_result.get('pages'):
                 self.logger.error('No pages found to scrape')
@@ -547,20 +2007,27 @@ class WebScraper:
             
             # Scrape data from each discovered page
             scraped_data = {}
-            for url in crawl_result['pages'].keys():
-                try:
-                    self.logger.debug(f'Scraping data from: {url}')
-                    soup = self.scrape(url, wait_time=wait_time)
-                    if soup:
+
+            def collect(url, data):
+                if on_item:
+                    on_item({'url': url, **data})
+                else:
+                    scraped_data[url] = data
+
+            urls = list(crawl_result['pages'].keys())
+            for start in range(0, len(urls), self.parallel):
+                batch = urls[start:start + self.parallel]
+                for url, soup in zip(batch, self._render_pages(batch, wait_time)):
+                    try:
+                        self.logger.debug(f'Scraping data from: {url}')
+                        if isinstance(soup, Exception):
+                            raise soup
                         data = self.extract_data(soup, selectors)
                         if data:
-                            scraped_data[url] = data
-                except Exception as e:
-                    self.logger.error(f"Failed to scrape {url}: {str(e)}")
-                    continue
-                
-                # Add a small delay between requests
-                time.sleep(1)
+                            collect(url, data)
+                    except Exception as e:
+                        self.logger.error(f"Failed to scrape {url}: {str(e)}")
+                        continue
             
             self.logger.debug(f'Crawl and scrape completed. Scraped {len(scraped_data)} pages')
             return {
@@ -570,7 +2037,7 @@ class WebScraper:
             
         except Exception as e:
             self.logger.error(f"Crawl and scrape failed: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             return {}
 
     def scrape_page(self, url, selectors):
@@ -590,24 +2057,56 @@ class WebScraper:
             
         except Exception as e:
             self.logger.error(f"Error scraping page {url}: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             raise ScrapingError(f"Failed to scrape page: {str(e)}")
 
-    def scrape_sitemap(self, url, selectors):
-        """Scrape all pages from a sitemap using the given selectors."""
+    def scrape_sitemap(self, url, selectors, on_item=None):
+        """
+        Scrape all pages from a sitemap using the given selectors.
+        
+        If on_item is given it is called with each page's data as soon as it is
+        scraped, and the data is not collected in the returned list.
+        """
         try:
             self.logger.info(f"Scraping sitemap: {url}")
-            urls = self.parse_sitemap(url)
+            selectors = self._compile_selectors(selectors)
+            urls = self.iter_sitemap(url)
+            first_url = next(urls, None)
             
-            if not urls:
+            if first_url is None:
                 raise ScrapingError("No URLs found in sitemap")
+            urls = itertools.chain([first_url], urls)
             
             results = []
+            if not self.use_selenium:
+                # Plain HTTP pages are fetched concurrently, a batch at a time while
+                # the rest of the sitemap is still being parsed
+                batch_size = self.concurrency * 10
+                while True:
+                    batch = list(itertools.islice(urls, batch_size))
+                    if not batch:
+                        break
+                    for page_url, data in zip(batch, self._fetch_and_extract(batch, selectors)):
+                        if isinstance(data, Exception):
+                            self.logger.error(f"Error scraping page {page_url}: {str(data)}")
+                            continue
+                        data['url'] = page_url
+                        data['slug'] = self._get_slug(page_url)
+                        if on_item:
+                            on_item(data)
+                        else:
+                            results.append(data)
+                return results
+
             for page_url in urls:
                 try:
                     self.logger.debug(f"Scraping page from sitemap: {page_url}")
                     page_data = self.scrape_page(page_url, selectors)
-                    results.extend(page_data)
+                    if on_item:
+                        for data in page_data:
+                            on_item(data)
+                    else:
+                        results.extend(page_data)
                 except Exception as e:
                     self.logger.error(f"Error scraping page {page_url}: {str(e)}")
                     continue
@@ -616,7 +2115,7 @@ class WebScraper:
             
         except Exception as e:
             self.logger.error(f"Error scraping sitemap {url}: {str(e)}")
-            self.logger.debug(traceback.format_exc())
+            self.logger.debug('Exception details', exc_info=True)
             raise ScrapingError(f"Failed to scrape sitemap: {str(e)}")
 
     def _get_slug(self, url):
@@ -1,21 +1,50 @@
+import asyncio
 import unittest
-from scraper import WebScraper
+from unittest import mock
+from bs4 import BeautifulSoup
+from scraper import WebScraper, DriverPool, HTTPCache, VisitedSet, BloomVisitedSet, RedisVisitedSet, SelectorError, canonicalize_url, _parse_worker, _parse_crawl_page, _render_with_selenium, _SharedDNSResolver, _extract_data_lxml, run_async, ProcessPool, RenderPool, PlaywrightBrowser
+import io
 import os
 import json
+import redis
 import requests
+from urllib.parse import urlparse
 from flask import Flask
-from app import app
+from werkzeug.serving import make_server
+from app import create_app, close_app, _JSONArrayWriter
+from schemas import ScrapeRequest
+from pydantic import ValidationError
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import socket
 import threading
 import time
 
+app = create_app('testing')
+
 class TestWebScraper(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
-        # Start Flask app in a separate thread
-        cls.flask_thread = threading.Thread(target=lambda: app.run(debug=False, port=5001))
+        # Serve the Flask app from a separate thread; the socket is bound on creation
+        cls.server = make_server('127.0.0.1', 5001, app)
+        cls.flask_thread = threading.Thread(target=cls.server.serve_forever)
         cls.flask_thread.daemon = True
         cls.flask_thread.start()
-        time.sleep(2)  # Wait for Flask to start
+        # Wait until the server accepts connections
+        deadline = time.monotonic() + 5
+        while True:
+            try:
+                socket.create_connection(('127.0.0.1', 5001), timeout=0.05).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.01)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.flask_thread.join()
 
     def setUp(self):
         self.scraper = WebScraper(use_selenium=False, debug=True)
@@ -37,6 +66,216 @@ class TestWebScraper(unittest.TestCase):
         self.assertIsNotNone(data)
         self.assertIn('title', data)
 
+    def test_extract_data_css_selectors(self):
+        """Test extraction with tag and CSS selectors"""
+        soup = BeautifulSoup('<h1>Title</h1><p class="lead">One</p><p>Two</p><a href="/x">Link</a>', 'lxml')
+        data = self.scraper.extract_data(soup, {'title': 'h1', 'lead': 'p.lead', 'paragraphs': 'p', 'link': 'a'})
+        self.assertEqual(data, {'title': 'Title', 'lead': 'One', 'paragraphs': ['One', 'Two'], 'link': 'Link (/x)'})
+
+    def test_extract_data_compiled_selectors(self):
+        """Test selectors compiled once give the same data as strings"""
+        soup = BeautifulSoup('<h1>Title</h1><p class="lead">One</p>', 'lxml')
+        compiled = self.scraper._compile_selectors({'title': 'h1', 'lead': 'p.lead'})
+        self.assertEqual(self.scraper.extract_data(soup, compiled), {'title': 'Title', 'lead': 'One'})
+        with self.assertRaises(SelectorError):
+            self.scraper._compile_selectors({'bad': 'p:::'})
+
+    def test_extract_data_lxml(self):
+        """Test the XPath extraction path gives the same data as BeautifulSoup"""
+        html = ('<div class="post"> Hi <b>there</b><script>x()</script><!-- note --></div>'
+                '<a href="/a"> A </a><a href="/b">B</a><img src="i.png">')
+        selectors = {'post': 'div.post', 'links': 'a', 'image': 'img', 'missing': '.none'}
+        self.assertEqual(_extract_data_lxml(html, selectors),
+                         self.scraper.extract_data(BeautifulSoup(html, 'lxml'), selectors))
+        # Selectors only soupsieve understands are left to BeautifulSoup
+        self.assertIsNone(_extract_data_lxml(html, {'post': 'div:-soup-contains("Hi")'}))
+
+    def test_extract_data_single_match(self):
+        """Test single-match selectors and lone IDs extract only the first element"""
+        soup = BeautifulSoup('<p id="a">One</p><p id="a">Two</p><span>x</span><span>y</span>', 'lxml')
+        selectors = {'first': {'selector': 'p', 'multi': False}, 'id': '#a',
+                     'all': {'selector': '#a', 'multi': True}, 'spans': 'span'}
+        expected = {'first': 'One', 'id': 'One', 'all': ['One', 'Two'], 'spans': ['x', 'y']}
+        self.assertEqual(self.scraper.extract_data(soup, selectors), expected)
+        self.assertEqual(self.scraper.extract_data(soup, self.scraper._compile_selectors(selectors)), expected)
+
+    def test_parse_worker(self):
+        """Test pool workers return extracted data, or the error for a bad page"""
+        self.assertEqual(_parse_worker(('<h1>Title</h1>', {'title': 'h1'})), {'title': 'Title'})
+        self.assertIsInstance(_parse_worker(('<h1>Title</h1>', {'title': 'h1:::'})), SelectorError)
+
+    def test_parse_crawl_page_links(self):
+        """Test a crawled page reports its title and same-domain links"""
+        html = ('<html><head><title>Home</title></head><body><p>Text</p>'
+                '<a href="/about">About</a><a href="https://other.com/">Other</a><a>None</a>'
+                '<a href="#top">Top</a><a href="javascript:void(0)">Menu</a></body></html>')
+        item, links = _parse_crawl_page('https://example.com/', html, None, 'example.com', True)
+        self.assertEqual(item['title'], 'Home')
+        self.assertIs(type(item['title']), str)  # Picklable for the parse pool
+        self.assertEqual(links, ['https://example.com/about'])
+
+    def test_parse_crawl_page_in_process_pool(self):
+        """Test link-only crawl pages come back intact from a parse pool worker"""
+        html = '<html><head><title>Home</title></head><body><a href="/about">About</a></body></html>'
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            item, links = pool.submit(_parse_crawl_page, 'https://example.com/', html, None,
+                                      'example.com', True).result()
+        self.assertEqual(item['title'], 'Home')
+        self.assertEqual(links, ['https://example.com/about'])
+
+    def test_crawl_survives_dead_parse_worker(self):
+        """Test a crawl still parses pages after a parse pool worker has died"""
+        pool = ProcessPool(1)
+        self.addCleanup(pool.shutdown)
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+        scraper = WebScraper(parse_pool=pool)
+        self.addCleanup(scraper.close)
+        result = scraper.crawl_website('http://127.0.0.1:5001/', max_pages=1)
+        self.assertEqual(result['total_pages'], 1)
+
+    def test_acrawl_cancels_pending_on_error(self):
+        """Test a crawl that fails in on_item leaves no fetches running on the shared loop"""
+        links = ''.join(f'<a href="/p{i}">p{i}</a>' for i in range(5))
+
+        async def fetch(session, semaphore, url):
+            if url == self.test_url:
+                return f'<title>Home</title>{links}'
+            if url.endswith('/p0'):
+                return '<title>p0</title>'
+            await asyncio.sleep(10)
+
+        def on_item(item):
+            if item['title'] == 'p0':
+                raise OSError('disk full')
+
+        async def other_tasks():
+            return len(asyncio.all_tasks()) - 1
+
+        with mock.patch.object(self.scraper, '_afetch', side_effect=fetch):
+            with self.assertRaises(OSError):
+                run_async(self.scraper.acrawl(self.test_url, max_pages=10, on_item=on_item))
+        self.assertEqual(run_async(other_tasks()), 0)
+
+    def test_throttle_per_host(self):
+        """Test requests are only delayed when the same host is hit too fast"""
+        scraper = WebScraper(rate_limit=2)
+        with mock.patch('scraper.time.sleep') as sleep, mock.patch('scraper.time.monotonic', return_value=100.0):
+            scraper._throttle('a.com')
+            scraper._throttle('b.com')
+            scraper._throttle('a.com')
+        sleep.assert_called_once_with(0.5)
+
+    def test_shared_dns_cache(self):
+        """Test a host resolved by one crawl's session is reused by the next"""
+        resolve = mock.AsyncMock(return_value=[{'host': '93.184.216.34', 'port': 80}])
+
+        async def lookup():
+            return await _SharedDNSResolver().resolve('example.com', 80)
+
+        with mock.patch('aiohttp.ThreadedResolver.resolve', resolve), mock.patch.dict('scraper._DNS_CACHE', clear=True):
+            self.assertEqual(asyncio.run(lookup()), asyncio.run(lookup()))
+        resolve.assert_awaited_once()
+
+    def test_run_async_from_threads(self):
+        """Test coroutines from several threads at once all run on one shared loop"""
+        async def running_loop():
+            await asyncio.sleep(0.01)
+            return asyncio.get_running_loop()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            loops = list(pool.map(lambda _: run_async(running_loop()), range(8)))
+        self.assertEqual(len(set(loops)), 1)
+
+    def test_rotates_user_agent_on_403(self):
+        """Test a 403 is retried once with a different User-Agent"""
+        blocked = mock.MagicMock(status_code=403)
+        ok = mock.MagicMock(status_code=200, content=b'<h1>Title</h1>', headers={})
+        with mock.patch.object(self.scraper.session, 'get', side_effect=[blocked, ok]) as get, \
+                mock.patch.object(self.scraper, '_rotate_user_agent') as rotate:
+            soup = self.scraper.scrape(self.test_url)
+        self.assertEqual(soup.h1.get_text(), 'Title')
+        self.assertEqual(get.call_count, 2)
+        rotate.assert_called_once()
+
+    def test_scrape_decodes_page_bytes(self):
+        """Test pages are decoded from the header's charset, or else from the page itself"""
+        pages = [
+            ({'Content-Type': 'text/html; charset=ISO-8859-1'}, '<p>Café</p>'.encode('latin-1')),
+            ({'Content-Type': 'text/html'}, '<p>Café</p>'.encode('utf-8')),
+            ({}, '<meta charset="windows-1252"><p>Café</p>'.encode('cp1252')),
+        ]
+        for headers, content in pages:
+            response = mock.MagicMock(status_code=200, headers=headers, content=content)
+            with mock.patch.object(self.scraper.session, 'get', return_value=response):
+                self.assertEqual(self.scraper.scrape(self.test_url).p.get_text(), 'Café')
+        # The XPath extraction path detects undeclared UTF-8 and declared charsets alike
+        for _, content in pages[1:]:
+            self.assertEqual(_extract_data_lxml(content, {'p': 'p'}), {'p': 'Café'})
+
+    def test_undeclared_utf8_skips_charset_detection(self):
+        """Test an undeclared UTF-8 page is parsed without a character detection pass"""
+        content = ('<title>Café</title><p>Café</p><a href="/about">About</a>' * 200).encode('utf-8')
+        response = mock.MagicMock(status_code=200, headers={}, content=content)
+        with mock.patch('bs4.dammit.chardet_dammit') as chardet, \
+                mock.patch.object(self.scraper.session, 'get', return_value=response):
+            self.assertEqual(self.scraper.scrape(self.test_url).p.get_text(), 'Café')
+            item, _ = _parse_crawl_page(self.test_url, content, {'p': 'p:nth-of-type(1)'}, 'example.com', True)
+            self.assertEqual(item['p'], 'Café')
+        chardet.assert_not_called()
+
+    def test_user_agent_rotation(self):
+        """Test rotation cycles through the shared User-Agent pool"""
+        with mock.patch('scraper._user_agent_pool', return_value=('UA1', 'UA2')):
+            scraper = WebScraper()
+        first = scraper.session.headers['User-Agent']
+        scraper._rotate_user_agent()
+        self.assertEqual({first, scraper.session.headers['User-Agent']}, {'UA1', 'UA2'})
+        scraper._rotate_user_agent()
+        self.assertEqual(scraper.session.headers['User-Agent'], first)
+
+    def test_selenium_form_auth_waits_for_redirect(self):
+        """Test a Selenium login returns as soon as the browser leaves the login page"""
+        driver = mock.MagicMock(current_url='https://example.com/login')
+        submit = mock.MagicMock()
+        submit.click.side_effect = lambda: setattr(driver, 'current_url', 'https://example.com/home')
+        driver.find_element.side_effect = lambda by, value: submit if by == 'css selector' else mock.MagicMock()
+        scraper = WebScraper(use_selenium=True, driver=driver)
+        start = time.monotonic()
+        self.assertTrue(scraper.authenticate('https://example.com/login', 'form',
+                                             {'username': 'user', 'password': 'pass'}))
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_iter_sitemap(self):
+        """Test sitemap URLs are streamed from the response body"""
+        response = mock.MagicMock(status_code=200, headers={})
+        response.__enter__.return_value = response
+        response.raw = io.BytesIO(b'<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                                  b'<url><loc>https://example.com/a</loc></url>'
+                                  b'<url><loc> https://example.com/b </loc><image:image xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">'
+                                  b'<image:loc>https://example.com/b.png</image:loc></image:image></url></urlset>')
+        with mock.patch.object(self.scraper.session, 'get', return_value=response):
+            self.assertEqual(list(self.scraper.iter_sitemap('https://example.com/sitemap.xml')),
+                             ['https://example.com/a', 'https://example.com/b'])
+
+    def test_iter_sitemap_index(self):
+        """Test the child sitemaps of an index are all followed, in index order"""
+        bodies = {
+            'https://example.com/sitemap.xml': b'<sitemapindex><sitemap><loc>https://example.com/1.xml</loc></sitemap>'
+                                               b'<sitemap><loc>https://example.com/2.xml</loc></sitemap></sitemapindex>',
+            'https://example.com/1.xml': b'<urlset><url><loc>https://example.com/a</loc></url></urlset>',
+            'https://example.com/2.xml': b'<urlset><url><loc>https://example.com/b</loc></url></urlset>',
+        }
+
+        def get(url, **kwargs):
+            response = mock.MagicMock(status_code=200, headers={}, raw=io.BytesIO(bodies[url]))
+            response.__enter__.return_value = response
+            return response
+
+        with mock.patch.object(self.scraper.session, 'get', side_effect=get):
+            self.assertEqual(self.scraper.parse_sitemap('https://example.com/sitemap.xml'),
+                             ['https://example.com/a', 'https://example.com/b'])
+
     def test_selenium_scraping(self):
         """Test Selenium-based scraping"""
         selenium_scraper = WebScraper(use_selenium=True, debug=True)
@@ -93,6 +332,187 @@ class TestWebScraper(unittest.TestCase):
             if os.path.exists(filename):
                 os.remove(filename)
 
+class TestCrawlDedup(unittest.TestCase):
+    def test_canonicalize_url(self):
+        """Test equivalent URL spellings share one canonical form"""
+        self.assertEqual(canonicalize_url('HTTP://Example.COM:80/a/?b=2&a=1#top'), 'http://example.com/a?a=1&b=2')
+        self.assertEqual(canonicalize_url('https://example.com:8443/'), 'https://example.com:8443')
+
+    def test_visited_set(self):
+        """Test only unseen URLs are reported as new"""
+        visited = VisitedSet()
+        self.assertEqual(visited.add_new(['a', 'b', 'a']), ['a', 'b'])
+        self.assertEqual(visited.add_new(['b', 'c']), ['c'])
+
+    def test_bloom_visited_set(self):
+        """Test the Bloom filter set reports only unseen URLs as new"""
+        visited = BloomVisitedSet()
+        self.assertEqual(visited.add_new(['a', 'b', 'a']), ['a', 'b'])
+        self.assertEqual(visited.add_new(['b', 'c']), ['c'])
+
+    def test_crawl_survives_redis_failure(self):
+        """Test a crawl keeps deduplicating locally when Redis fails, off the loop thread"""
+        site = {'/': ['/a', '/b'], '/a': ['/b', '/c'], '/b': ['/a'], '/c': ['/']}
+        threads = []
+
+        def execute():
+            threads.append(threading.current_thread())
+            if len(threads) > 1:
+                raise redis.ConnectionError('connection lost')
+            return [1, True]
+
+        client = mock.MagicMock()
+        client.pipeline.return_value.execute.side_effect = execute
+        visited = RedisVisitedSet(client, 'crawl:test:visited')
+
+        async def fetch(session, semaphore, url):
+            return ''.join(f'<a href="{link}">x</a>' for link in site[urlparse(url).path or '/'])
+
+        async def loop_thread():
+            return threading.current_thread()
+
+        scraper = WebScraper()
+        pages = []
+        with mock.patch.object(scraper, '_afetch', side_effect=fetch):
+            run_async(scraper.acrawl('http://example.com/', max_pages=10,
+                                          on_item=pages.append, visited=visited))
+        # The start URL was recorded before the failure, so it may be crawled once more
+        self.assertEqual({urlparse(page['url']).path for page in pages}, {'/', '/a', '/b', '/c'})
+        self.assertNotIn(run_async(loop_thread()), threads)
+
+    def test_selenium_crawl_breadth_first(self):
+        """Test a Selenium crawl visits pages in breadth-first order"""
+        site = {'/': ['/a', '/b'], '/a': ['/c'], '/b': ['/d'], '/c': [], '/d': []}
+        driver = mock.MagicMock()
+        driver.get.side_effect = lambda url: setattr(driver, 'page_source', ''.join(
+            f'<a href="{link}">x</a>' for link in site[urlparse(url).path or '/']))
+        scraper = WebScraper(use_selenium=True, driver=driver)
+        pages = []
+        scraper.crawl_website('https://example.com/', on_item=lambda item: pages.append(item['url']))
+        self.assertEqual(pages, ['https://example.com/'] + [f'https://example.com/{p}' for p in 'abcd'])
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        self.path = 'test_httpcache.db'
+        self.cache = HTTPCache(self.path)
+
+    def tearDown(self):
+        self.cache.close()
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def test_stores_validated_responses(self):
+        """Test a response with an ETag is stored with its conditional headers"""
+        self.cache.set('https://example.com', {'ETag': '"v1"'}, b'<html></html>')
+        headers, body = self.cache.get('https://example.com')
+        self.assertEqual(headers, {'If-None-Match': '"v1"'})
+        self.assertEqual(body, b'<html></html>')
+
+    def test_skips_unvalidated_responses(self):
+        """Test a response without validators is not stored"""
+        self.cache.set('https://example.com', {}, b'<html></html>')
+        self.assertIsNone(self.cache.get('https://example.com'))
+
+    def test_evicts_expired_responses(self):
+        """Test responses older than the TTL are neither served nor kept"""
+        self.cache.set('https://example.com/old', {'ETag': '"v1"'}, b'old')
+        with mock.patch('scraper.time.time', return_value=time.time() + self.cache.ttl + 1):
+            self.assertIsNone(self.cache.get('https://example.com/old'))
+            self.cache.set('https://example.com/new', {'ETag': '"v1"'}, b'new')
+        count = self.cache._conn.execute('SELECT COUNT(*) FROM http').fetchone()[0]
+        self.assertEqual(count, 1)
+
+class TestDriverPool(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch('scraper._create_chrome_driver', side_effect=lambda remote_url=None: mock.MagicMock(session_id='abc'))
+        self.create_driver = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_released_driver(self):
+        """Test a released driver is reset and handed out again"""
+        pool = DriverPool(size=2, max_uses=5)
+        driver = pool.acquire()
+        pool.release(driver)
+        self.assertIs(pool.acquire(), driver)
+        self.assertEqual(self.create_driver.call_count, 1)
+        driver.delete_all_cookies.assert_called_once()
+
+    def test_recycles_worn_out_driver(self):
+        """Test a driver is quit once it reaches max_uses"""
+        pool = DriverPool(size=1, max_uses=1)
+        driver = pool.acquire()
+        pool.release(driver)
+        driver.quit.assert_called_once()
+        self.assertIsNot(pool.acquire(), driver)
+
+    def test_remote_sessions(self):
+        """Test drivers are opened on the configured Selenium server"""
+        pool = DriverPool(size=1, remote_url='http://localhost:4444/wd/hub')
+        pool.acquire()
+        self.create_driver.assert_called_once_with('http://localhost:4444/wd/hub')
+
+class TestRenderWorker(unittest.TestCase):
+    def test_render_with_selenium(self):
+        """Test a render worker returns its browser's page source"""
+        driver = mock.MagicMock(page_source='<h1>Title</h1>')
+        with mock.patch('scraper._worker_driver', driver):
+            self.assertEqual(_render_with_selenium('https://example.com'), '<h1>Title</h1>')
+        driver.get.assert_called_once_with('https://example.com')
+
+    def test_render_pool_restarts(self):
+        """Test a render pool starts new workers once one of them has died"""
+        with mock.patch('scraper._init_worker_driver'):
+            pool = RenderPool(1)
+            self.addCleanup(pool.shutdown)
+            with self.assertRaises(BrokenProcessPool):
+                pool.submit(os._exit, 1).result()
+            self.assertEqual(pool.submit(abs, -1).result(), 1)
+
+    def test_render_pages_retries_broken_pool(self):
+        """Test pages lost with a dead render worker are rendered again"""
+        lost, rendered = Future(), Future()
+        lost.set_exception(BrokenProcessPool())
+        rendered.set_result('<h1>Title</h1>')
+        pool = mock.MagicMock()
+        pool.submit.side_effect = [lost, rendered]
+        scraper = WebScraper(use_selenium=True, render_pool=pool)
+        self.assertEqual(scraper._render_pages(['https://example.com'])[0].h1.text, 'Title')
+        self.assertEqual(pool.submit.call_count, 2)
+
+    def test_playwright_browser(self):
+        """Test the Playwright engine renders pages on its own event loop"""
+        playwright = mock.AsyncMock()
+        page = playwright.chromium.launch.return_value.new_context.return_value.new_page.return_value
+        page.content.return_value = '<h1>Title</h1>'
+        starter = mock.MagicMock()
+        starter.return_value.start = mock.AsyncMock(return_value=playwright)
+        with mock.patch('scraper.async_playwright', starter):
+            scraper = WebScraper(use_selenium=True, engine='playwright')
+        try:
+            self.assertEqual(scraper.scrape('https://example.com').h1.text, 'Title')
+            page.goto.assert_awaited_once_with('https://example.com', wait_until='networkidle')
+            page.close.assert_awaited_once()
+        finally:
+            scraper.close()
+        playwright.stop.assert_awaited_once()
+
+    def test_shared_playwright_browser(self):
+        """Test scrapers sharing a Playwright browser each get a context and leave it open"""
+        playwright = mock.AsyncMock()
+        launched = playwright.chromium.launch.return_value
+        starter = mock.MagicMock()
+        starter.return_value.start = mock.AsyncMock(return_value=playwright)
+        with mock.patch('scraper.async_playwright', starter):
+            browser = PlaywrightBrowser()
+        for _ in range(2):
+            WebScraper(use_selenium=True, engine='playwright', browser=browser).close()
+        self.assertEqual(launched.new_context.await_count, 2)
+        self.assertEqual(launched.new_context.return_value.close.await_count, 2)
+        launched.close.assert_not_awaited()
+        browser.close()
+        launched.close.assert_awaited_once()
+
 class TestFlaskApp(unittest.TestCase):
     def setUp(self):
         self.app = app.test_client()
@@ -104,30 +524,71 @@ class TestFlaskApp(unittest.TestCase):
         self.assertEqual(response.status_code, 200)
 
     def test_scrape_endpoint(self):
-        """Test the scrape endpoint"""
+        """Test a scrape job's result can be collected from another worker process"""
         test_data = {
             'url': 'https://example.com',
-            'use_selenium': False,
-            'selectors': {
+            'selectors': json.dumps({
                 'title': 'h1',
                 'paragraphs': 'p'
-            }
+            })
         }
-        response = self.app.post('/scrape', json=test_data)
+        page = mock.MagicMock(status_code=200, headers={'Content-Type': 'text/html; charset=utf-8'},
+                              content=b'<h1>Example</h1><p>One</p><p>Two</p>')
+        # A second app stands in for another Gunicorn worker
+        other_app = create_app('testing')
+        self.addCleanup(close_app, other_app)
+        other_worker = other_app.test_client()
+        with mock.patch('requests.Session.get', return_value=page):
+            response = self.app.post('/scrape', data=test_data)
+            self.assertEqual(response.status_code, 202)
+            data = json.loads(response.data)
+            self.assertIn('job_id', data)
+            deadline = time.time() + 10
+            while not other_worker.get(data['status_url']).get_json()['done']:
+                self.assertLess(time.time(), deadline)
+                time.sleep(0.05)
+        response = other_worker.get(data['result_url'])
         self.assertEqual(response.status_code, 200)
-        data = json.loads(response.data)
-        self.assertIn('success', data)
-        self.assertTrue(data['success'])
+        result = response.get_json()
+        self.addCleanup(os.remove, os.path.join(app.config['UPLOAD_FOLDER'], os.path.basename(result['download_url'])))
+        self.assertEqual(result['count'], 1)
+        # A result is collected once
+        self.assertEqual(self.app.get(data['result_url']).status_code, 404)
 
     def test_invalid_url(self):
         """Test scraping with invalid URL"""
         test_data = {
             'url': 'invalid-url',
-            'use_selenium': False,
-            'selectors': {}
+            'selectors': '{}'
         }
-        response = self.app.post('/scrape', json=test_data)
-        self.assertEqual(response.status_code, 500)
+        response = self.app.post('/scrape', data=test_data)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('url', response.get_json()['error'])
+
+    def test_scrape_request_validation(self):
+        """Test form values are coerced and bounded by the request schema"""
+        scrape_request = ScrapeRequest.from_form({
+            'url': 'https://example.com',
+            'selectors': '{"title": "h1"}',
+            'is_crawl': 'on',
+            'max_pages': '500'
+        })
+        self.assertTrue(scrape_request.is_crawl)
+        self.assertFalse(scrape_request.same_domain_only)
+        self.assertEqual(scrape_request.max_pages, 100)
+        self.assertEqual(scrape_request.selectors, {'title': 'h1'})
+        with self.assertRaises(ValidationError):
+            ScrapeRequest.from_form({'url': 'https://example.com', 'max_pages': 'many'})
+        with self.assertRaises(ValidationError):
+            ScrapeRequest.from_form({'url': 'https://example.com', 'selectors': '{"title": {"multi": false}}'})
+
+    def test_scrape_request_selector_specs(self):
+        """Test selectors may be given as specs choosing single or multiple matches"""
+        scrape_request = ScrapeRequest.from_form({
+            'url': 'https://example.com',
+            'selectors': '{"title": "h1", "lead": {"selector": "p", "multi": false}}'
+        })
+        self.assertEqual(scrape_request.selectors, {'title': 'h1', 'lead': {'selector': 'p', 'multi': False}})
 
     def test_missing_url(self):
         """Test scraping without URL"""
@@ -138,5 +599,86 @@ class TestFlaskApp(unittest.TestCase):
         response = self.app.post('/scrape', json=test_data)
         self.assertEqual(response.status_code, 400)
 
+    def test_unknown_job(self):
+        """Test status and result of an unknown scrape job"""
+        self.assertEqual(self.app.get('/scrape/status/missing').status_code, 404)
+        self.assertEqual(self.app.get('/scrape/result/missing').status_code, 404)
+
+    def test_expired_job(self):
+        """Test a scrape job that was never collected is forgotten after JOB_TTL"""
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], 'jobs', 'stale.json')
+        with open(filepath, 'wb') as f:
+            f.write(b'{"done": false}')
+        stale = time.time() - app.config['JOB_TTL'] - 1
+        os.utime(filepath, (stale, stale))
+        self.assertEqual(self.app.get('/scrape/status/stale').status_code, 404)
+        self.assertFalse(os.path.exists(filepath))
+
+    def test_running_job_outlives_ttl(self):
+        """Test a job still running in a live worker is not expired after JOB_TTL"""
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], 'jobs', 'slow.json')
+        self.addCleanup(os.remove, filepath)
+        with open(filepath, 'wb') as f:
+            f.write(json.dumps({'done': False, 'pid': os.getpid()}).encode())
+        stale = time.time() - app.config['JOB_TTL'] - 1
+        os.utime(filepath, (stale, stale))
+        self.assertEqual(self.app.get('/scrape/status/slow').get_json(), {'done': False})
+
+    def test_create_app_reuses_log_handler(self):
+        """Test repeated create_app calls don't stack log handlers"""
+        first_app = create_app('testing')
+        self.addCleanup(close_app, first_app)
+        handlers = list(first_app.logger.handlers)
+        second_app = create_app('testing')
+        self.addCleanup(close_app, second_app)
+        self.assertEqual(second_app.logger.handlers, handlers)
+
+    def test_close_app(self):
+        """Test closing an app shuts down the pools it created"""
+        other_app = create_app('testing')
+        parse_pool = other_app.extensions['parse_pool']
+        close_app(other_app)
+        self.assertNotIn('parse_pool', other_app.extensions)
+        with self.assertRaises(RuntimeError):
+            parse_pool.submit(abs, -1)
+
+    def test_stream_requires_url(self):
+        """Test the streaming endpoint rejects a request without a URL"""
+        response = self.app.get('/scrape/stream')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.get_json())
+
+    def test_stream_reports_setup_failure(self):
+        """Test the stream sends an error event when the scraper cannot be created"""
+        with mock.patch('app.WebScraper', side_effect=RuntimeError('no session')):
+            response = self.app.get('/scrape/stream?url=https://example.com')
+            body = response.get_data(as_text=True)
+        self.assertIn('event: error', body)
+        self.assertIn('no session', body)
+
+    def test_scrape_responses_not_cached(self):
+        """Test scrape responses tell browsers not to cache them"""
+        self.assertEqual(self.app.get('/scrape/status/missing').headers['Cache-Control'], 'no-store')
+        self.assertNotIn('Cache-Control', self.app.get('/').headers)
+
+    def test_preview_endpoint(self):
+        """Test the preview endpoint returns the first records of a results file"""
+        filename = 'test_preview.json'
+        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
+        try:
+            with _JSONArrayWriter(filepath) as writer:
+                for i in range(5):
+                    writer.write({'url': f'https://example.com/{i}'})
+            with open(filepath) as f:
+                self.assertEqual(len(json.load(f)), 5)
+
+            response = self.app.get(f'/preview/{filename}?limit=2')
+            self.assertEqual(response.status_code, 200)
+            data = json.loads(response.data)
+            self.assertEqual(data['data'], [{'url': 'https://example.com/0'}, {'url': 'https://example.com/1'}])
+        finally:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+
 if __name__ == '__main__':
     unittest.main(verbosity=2) 
\ No newline at end of file